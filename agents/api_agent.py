@@ -3,18 +3,95 @@ API Agent with proper token tracking
 Fetches from academic and news APIs with accurate metrics
 """
 
+import io
+import logging
 import os
 import aiohttp
 import asyncio
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Union
 from datetime import datetime
+from urllib.parse import urlsplit, urlunsplit
 
+from lxml import etree
 
-class APIAgent:
+from agents.http_session import PooledSessionMixin
+from utils import json_codec
+from utils.caching import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Responses are keyed by (query, max_results); papers change slowly, news faster
+_ARXIV_CACHE = TTLCache(maxsize=512, ttl=900)
+_NEWS_CACHE = TTLCache(maxsize=512, ttl=300)
+
+# arXiv Atom feed namespace and XPath lookups, compiled once at import
+_ATOM_NS = {'atom': 'http://www.w3.org/2005/Atom'}
+_ATOM_ENTRY = '{http://www.w3.org/2005/Atom}entry'
+_XP_TITLE = etree.XPath('atom:title/text()', namespaces=_ATOM_NS)
+_XP_SUMMARY = etree.XPath('atom:summary/text()', namespaces=_ATOM_NS)
+_XP_ID = etree.XPath('atom:id/text()', namespaces=_ATOM_NS)
+
+
+def _canonical_url(url: str) -> str:
+    """Reduce a URL to scheme, lowercased host and path for duplicate detection"""
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path.rstrip('/'), '', ''))
+
+
+def _title_key(title: str, strip_site: bool = False) -> str:
+    """Normalise a title; with *strip_site*, drop the ' - Site Name' suffix news aggregators add"""
+    if strip_site:
+        head, sep, _ = title.rpartition(' - ')
+        if sep:
+            title = head
+    return ' '.join(title.lower().split())
+
+
+def _dedup_sources(sources: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop sources whose canonical URL or normalised title was already seen"""
+    seen_urls = set()
+    seen_titles = set()
+    unique = []
+    
+    for source in sources:
+        url_key = _canonical_url(source.get('url') or '')
+        # Only news titles carry a site suffix; " - " in a paper title is meaningful
+        title_key = _title_key(source.get('title') or '', strip_site=source.get('source_type') == 'news')
+        if (url_key and url_key in seen_urls) or (title_key and title_key in seen_titles):
+            continue
+        seen_urls.add(url_key)
+        seen_titles.add(title_key)
+        unique.append(source)
+    
+    return unique
+
+
+class APIAgent(PooledSessionMixin):
     """
     API research agent for academic papers and news
     """
     
+    # Short connect timeout so a dead host fails fast; reads get a bit longer
+    REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=3, sock_read=8)
+    
+    # Transient upstream failures are retried with exponential backoff
+    RETRY_ATTEMPTS = 3
+    RETRY_BACKOFF = 0.4
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    
+    # Source kinds queried per domain, and the method fetching each kind
+    _DOMAIN_SOURCES = {
+        "academic": ("arxiv",),
+        "medical": ("arxiv",),
+        "technology": ("arxiv", "news"),
+        "stocks": ("news",),
+    }
+    _ALL_SOURCES = ("arxiv", "news")
+    _SOURCE_HANDLERS = {
+        "arxiv": "_arxiv_sources",
+        "news": "_news_sources",
+    }
+    
     def __init__(self):
         self.news_api_key = os.getenv("NEWS_API_KEY")
         self.arxiv_base_url = "http://export.arxiv.org/api/query"
@@ -23,9 +100,13 @@ class APIAgent:
         # Token estimation (since these APIs don't return token counts)
         self.avg_tokens_per_source = 150  # Estimated tokens per source metadata
         
+        # Shared HTTP session, created lazily inside the running event loop
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        
     async def research(
         self,
-        query: str,
+        query: Union[str, List[str]],
         domain: str = "general",
         max_sources: int = 10
     ) -> Dict[str, Any]:
@@ -33,42 +114,31 @@ class APIAgent:
         Execute API research across academic and news sources
         
         Args:
-            query: Research question
+            query: Research question, or several related questions whose
+                arXiv searches are batched into a single request
             domain: Research domain
             max_sources: Maximum sources to fetch
             
         Returns:
             Dictionary with research results and metrics
         """
-        print(f"   📚 API Agent: Fetching sources for '{query}'")
-        
-        sources = []
+        logger.debug("API Agent starting domain=%s query=%s", domain, query)
         
-        # Fetch from different sources based on domain
-        if domain in ["academic", "medical", "technology"]:
-            # Academic sources
-            arxiv_sources = await self._fetch_arxiv(query, max_sources // 2)
-            sources.extend(arxiv_sources)
+        queries = [query] if isinstance(query, str) else list(query)
         
-        if domain in ["stocks", "technology"]:
-            # News sources
-            if self.news_api_key:
-                news_sources = await self._fetch_news(query, max_sources // 2)
-                sources.extend(news_sources)
+        # Domain-specific sources are fetched concurrently so total latency is
+        # bounded by the slowest source rather than the sum of all of them
+        fetchers = self._source_fetchers(
+            self._DOMAIN_SOURCES.get(domain, ()),
+            queries,
+            max_sources // 2
+        )
+        sources = await self._gather_sources(fetchers, limit=max_sources)
         
         # If no domain-specific sources, get both
         if not sources:
-            arxiv_task = self._fetch_arxiv(query, max_sources // 2)
-            news_task = self._fetch_news(query, max_sources // 2) if self.news_api_key else asyncio.sleep(0)
-            
-            arxiv_sources, news_sources = await asyncio.gather(
-                arxiv_task,
-                news_task if self.news_api_key else asyncio.sleep(0)
-            )
-            
-            sources.extend(arxiv_sources)
-            if news_sources and isinstance(news_sources, list):
-                sources.extend(news_sources)
+            fetchers = self._source_fetchers(self._ALL_SOURCES, queries, max_sources // 2)
+            sources = await self._gather_sources(fetchers, limit=max_sources)
         
         # Estimate tokens based on actual content
         total_tokens = self._estimate_tokens(sources)
@@ -89,10 +159,138 @@ class APIAgent:
             "timestamp": datetime.now().isoformat()
         }
         
-        print(f"   ✅ API Agent: {len(sources)} sources, {total_tokens} estimated tokens")
+        logger.info("API Agent: %d sources, %d estimated tokens", len(sources), total_tokens)
         
         return result
     
+    async def _get_with_retry(self, url: str, params: Dict[str, Any]) -> bytes:
+        """
+        GET a URL and return the response body, retrying transient failures
+        
+        429 and 5xx responses are retried up to RETRY_ATTEMPTS times, waiting
+        for Retry-After when the server sends one and backing off otherwise.
+        
+        Args:
+            url: Endpoint URL
+            params: Query parameters
+            
+        Returns:
+            Raw response body
+            
+        Raises:
+            aiohttp.ClientResponseError: For non-retryable or exhausted errors
+        """
+        for attempt in range(self.RETRY_ATTEMPTS + 1):
+            async with self._get_session().get(
+                url,
+                params=params,
+                timeout=self.REQUEST_TIMEOUT
+            ) as response:
+                if response.status in self.RETRY_STATUSES and attempt < self.RETRY_ATTEMPTS:
+                    delay = self.RETRY_BACKOFF * (2 ** attempt)
+                    retry_after = response.headers.get("Retry-After", "")
+                    if retry_after.isdigit():
+                        delay = max(delay, float(retry_after))
+                    logger.info(
+                        "Retrying %s after HTTP %d (attempt %d, %.1fs)",
+                        url,
+                        response.status,
+                        attempt + 1,
+                        delay
+                    )
+                else:
+                    response.raise_for_status()
+                    return await response.read()
+            
+            await asyncio.sleep(delay)
+    
+    def _source_fetchers(
+        self,
+        kinds: Any,
+        queries: List[str],
+        max_results: int
+    ) -> List[Any]:
+        """
+        Build fetch coroutines for the given source kinds
+        
+        News is skipped when no API key is configured.
+        
+        Args:
+            kinds: Source kinds from _DOMAIN_SOURCES
+            queries: Search queries
+            max_results: Maximum results per source
+            
+        Returns:
+            Coroutines each returning a list of sources
+        """
+        return [
+            getattr(self, self._SOURCE_HANDLERS[kind])(queries, max_results)
+            for kind in kinds
+            if kind != "news" or self.news_api_key
+        ]
+    
+    async def _arxiv_sources(self, queries: List[str], max_results: int) -> List[Dict[str, Any]]:
+        """Fetch arXiv papers for one query, or for several in one batched request"""
+        if len(queries) == 1:
+            return await self._fetch_arxiv(queries[0], max_results)
+        
+        buckets = await self._fetch_arxiv_batch(queries, max_results)
+        return [source for q in queries for source in buckets[q]]
+    
+    async def _news_sources(self, queries: List[str], max_results: int) -> List[Dict[str, Any]]:
+        """Fetch news articles for each query concurrently"""
+        return await self._gather_sources([self._fetch_news(q, max_results) for q in queries])
+    
+    async def _gather_sources(
+        self,
+        fetchers: List[Any],
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run source fetchers concurrently and merge their results
+        
+        Results are merged in fetcher order regardless of completion order.
+        Once ``limit`` unique sources have arrived, fetchers still in flight
+        are cancelled rather than awaited.
+        
+        Args:
+            fetchers: Coroutines each returning a list of sources
+            limit: Stop waiting once this many unique sources are collected
+            
+        Returns:
+            Combined list of unique source dictionaries
+        """
+        async def indexed(idx: int, fetcher: Any) -> Any:
+            return idx, await fetcher
+        
+        tasks = [asyncio.ensure_future(indexed(idx, f)) for idx, f in enumerate(fetchers)]
+        results: Dict[int, List[Dict[str, Any]]] = {}
+        
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    idx, fetched = await next_done
+                except Exception as e:
+                    logger.warning("API Agent fetch error: %s", e)
+                    continue
+                
+                if fetched:
+                    results[idx] = fetched
+                    merged = [source for r in results.values() for source in r]
+                    if limit is not None and len(_dedup_sources(merged)) >= limit:
+                        break
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+        
+        sources = [source for idx in sorted(results) for source in results[idx]]
+        
+        # Aggregators republish the same story, so collapse overlaps before
+        # the sources are handed on for summarisation
+        sources = _dedup_sources(sources)
+        return sources[:limit] if limit is not None else sources
+    
     async def _fetch_arxiv(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
         """
         Fetch academic papers from arXiv
@@ -101,6 +299,70 @@ class APIAgent:
             query: Search query
             max_results: Maximum results to return
             
+        Returns:
+            List of source dictionaries
+        """
+        cache_key = (query, max_results)
+        cached = _ARXIV_CACHE.get(cache_key)
+        if cached is not None:
+            return list(cached)
+        
+        sources = await self._query_arxiv(f"all:{query}", max_results)
+        
+        if sources:
+            _ARXIV_CACHE.set(cache_key, sources)
+        
+        return list(sources)
+    
+    async def _fetch_arxiv_batch(
+        self,
+        queries: List[str],
+        max_results_each: int = 5
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetch papers for several queries with a single arXiv request
+        
+        The queries are OR-ed into one search and each returned paper is
+        assigned to the query whose terms best overlap its title and summary.
+        
+        Args:
+            queries: Search queries
+            max_results_each: Maximum results to keep per query
+            
+        Returns:
+            Mapping of query to its list of source dictionaries
+        """
+        buckets: Dict[str, List[Dict[str, Any]]] = {q: [] for q in queries}
+        if not queries:
+            return buckets
+        
+        search_query = " OR ".join(f"all:({q})" for q in queries)
+        papers = await self._query_arxiv(search_query, max_results_each * len(queries))
+        
+        query_terms = {q: set(q.lower().split()) for q in queries}
+        
+        for paper in papers:
+            paper_terms = set(f"{paper['title']} {paper['description']}".lower().split())
+            open_queries = [q for q in queries if len(buckets[q]) < max_results_each]
+            if not open_queries:
+                break
+            best = max(open_queries, key=lambda q: len(query_terms[q] & paper_terms))
+            buckets[best].append(paper)
+        
+        for q, sources in buckets.items():
+            if sources:
+                _ARXIV_CACHE.set((q, max_results_each), sources)
+        
+        return buckets
+    
+    async def _query_arxiv(self, search_query: str, max_results: int) -> List[Dict[str, Any]]:
+        """
+        Run one arXiv API search and parse the Atom feed
+        
+        Args:
+            search_query: arXiv search_query expression
+            max_results: Maximum results to return
+            
         Returns:
             List of source dictionaries
         """
@@ -108,44 +370,45 @@ class APIAgent:
         
         try:
             params = {
-                "search_query": f"all:{query}",
+                "search_query": search_query,
                 "start": 0,
                 "max_results": max_results,
                 "sortBy": "relevance",
                 "sortOrder": "descending"
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    self.arxiv_base_url,
-                    params=params,
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-                    response.raise_for_status()
-                    xml_content = await response.text()
-            
-            # Parse XML (simple extraction)
-            import xml.etree.ElementTree as ET
-            root = ET.fromstring(xml_content)
-            
-            # Namespace
-            ns = {'atom': 'http://www.w3.org/2005/Atom'}
+            xml_content = await self._get_with_retry(self.arxiv_base_url, params)
             
-            for entry in root.findall('atom:entry', ns):
-                title_elem = entry.find('atom:title', ns)
-                summary_elem = entry.find('atom:summary', ns)
-                id_elem = entry.find('atom:id', ns)
+            # Stream entries so only one is held in memory at a time
+            for _, entry in etree.iterparse(
+                io.BytesIO(xml_content),
+                events=('end',),
+                tag=_ATOM_ENTRY
+            ):
+                ids = _XP_ID(entry)
+                titles = _XP_TITLE(entry)
                 
-                if title_elem is not None and id_elem is not None:
+                if ids:
+                    summaries = _XP_SUMMARY(entry)
                     sources.append({
-                        "title": title_elem.text.strip() if title_elem.text else "No Title",
-                        "url": id_elem.text.strip() if id_elem.text else "#",
-                        "description": summary_elem.text.strip()[:200] + "..." if summary_elem is not None and summary_elem.text else "No description",
+                        "title": titles[0].strip() if titles else "No Title",
+                        "url": ids[0].strip(),
+                        "description": summaries[0].strip()[:200] + "..." if summaries else "No description",
                         "source_type": "academic"
                     })
+                
+                entry.clear()
+                
+                # Entries arrive in rank order, so the tail can be skipped
+                if len(sources) >= max_results:
+                    break
             
+        except asyncio.TimeoutError:
+            logger.warning("arXiv fetch timed out")
+        except aiohttp.ClientResponseError as e:
+            logger.warning("arXiv fetch failed: %s returned HTTP %d", e.request_info.real_url, e.status)
         except Exception as e:
-            print(f"   ⚠️ arXiv fetch error: {e}")
+            logger.warning("arXiv fetch error: %s", e)
         
         return sources
     
@@ -163,6 +426,11 @@ class APIAgent:
         if not self.news_api_key:
             return []
         
+        cache_key = (query, max_results)
+        cached = _NEWS_CACHE.get(cache_key)
+        if cached is not None:
+            return list(cached)
+        
         sources = []
         
         try:
@@ -174,14 +442,7 @@ class APIAgent:
                 "language": "en"
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    self.news_base_url,
-                    params=params,
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-                    response.raise_for_status()
-                    data = await response.json()
+            data = json_codec.loads(await self._get_with_retry(self.news_base_url, params))
             
             articles = data.get('articles', [])
             
@@ -193,10 +454,18 @@ class APIAgent:
                     "source_type": "news"
                 })
             
+        except asyncio.TimeoutError:
+            logger.warning("News API fetch timed out")
+        except aiohttp.ClientResponseError as e:
+            # Only the path is logged; the query string carries the API key
+            logger.warning("News API fetch failed: %s returned HTTP %d", e.request_info.real_url.path, e.status)
         except Exception as e:
-            print(f"   ⚠️ News API fetch error: {e}")
+            logger.warning("News API fetch error: %s", e)
         
-        return sources
+        if sources:
+            _NEWS_CACHE.set(cache_key, sources)
+        
+        return list(sources)
     
     def _estimate_tokens(self, sources: List[Dict[str, Any]]) -> int:
         """
@@ -208,20 +477,11 @@ class APIAgent:
         Returns:
             Estimated token count
         """
-        total_tokens = 0
-        
-        for source in sources:
-            # Count tokens based on actual text length
-            title = source.get('title', '')
-            description = source.get('description', '')
-            
-            # Rough estimation: 1 token ≈ 4 characters
-            title_tokens = len(title) // 4
-            desc_tokens = len(description) // 4
-            
-            # Add metadata overhead (URL, type, etc.) - approximately 20 tokens
-            metadata_tokens = 20
-            
-            total_tokens += title_tokens + desc_tokens + metadata_tokens
+        # Rough estimation: 1 token ≈ 4 characters of title and description,
+        # plus about 20 tokens of metadata overhead (URL, type, etc.) per source
+        text_tokens = sum(
+            (len(source.get('title', '')) + len(source.get('description', ''))) >> 2
+            for source in sources
+        )
         
-        return total_tokens
\ No newline at end of file
+        return text_tokens + 20 * len(sources)
\ No newline at end of file
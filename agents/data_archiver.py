@@ -1,13 +1,13 @@
 ﻿"""Agent that archives the research state to disk."""
 from __future__ import annotations
 
-import json
 import re
 from datetime import datetime
 from pathlib import Path
 from typing import Dict
 
 from graph.state import ResearchState
+from utils import json_codec
 
 _DATA_DIR = Path(__file__).resolve().parents[2] / "data" / "json"
 
@@ -27,7 +27,6 @@ def archive_state(state: ResearchState) -> Dict[str, str]:
     filename = f"{timestamp}_{_slugify(topic)}.json"
     filepath = _DATA_DIR / filename
 
-    with filepath.open("w", encoding="utf-8") as handle:
-        json.dump(state, handle, ensure_ascii=False, indent=2, default=str)
+    filepath.write_bytes(json_codec.dumps(state, indent=True, default=str))
 
     return {"archive_path": str(filepath.relative_to(Path(__file__).resolve().parents[2]))}
@@ -0,0 +1,86 @@
+"""
+Pooled aiohttp session shared by the async research agents
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+class PooledSessionMixin:
+    """
+    Keep one aiohttp session per agent, rebuilt when the event loop changes
+
+    Reusing one session keeps TCP/TLS connections alive across fetches. A
+    session is bound to the loop it was created in, so driving the agent from
+    a different loop releases the old session before building a new one.
+    """
+
+    _session: Optional[aiohttp.ClientSession] = None
+    _session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Return the pooled HTTP session for the current event loop
+
+        Returns:
+            Shared aiohttp client session
+        """
+        loop = asyncio.get_running_loop()
+
+        if self._session is not None and self._session_loop is not loop:
+            self._release_session()
+
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=32,
+                    limit_per_host=8,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=60
+                )
+            )
+            self._session_loop = loop
+
+        return self._session
+
+    def _release_session(self) -> None:
+        """
+        Close a session that belongs to another event loop
+
+        A session cannot be awaited from a foreign loop. If its loop is still
+        running (on another thread) the close is scheduled there; otherwise
+        the loop is gone, so the connector is detached and closed directly.
+        """
+        session, loop = self._session, self._session_loop
+        self._session = None
+        self._session_loop = None
+
+        if session is None or session.closed:
+            return
+
+        if loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+            return
+
+        connector = session.connector
+        session.detach()
+        try:
+            connector.close()
+        except RuntimeError as e:
+            # The owning loop is already closed; its sockets went with it
+            logger.debug("Dropped connector of closed event loop: %s", e)
+
+    async def close(self) -> None:
+        """Close the pooled HTTP session if one is open"""
+        if self._session is not None and not self._session.closed:
+            if self._session_loop is asyncio.get_running_loop():
+                await self._session.close()
+            else:
+                self._release_session()
+        self._session = None
+        self._session_loop = None
@@ -4,8 +4,13 @@ Handles various Perplexity API response formats
 """
 
 import os
+import re
+import string
+import asyncio
+import logging
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
 try:
@@ -17,12 +22,69 @@ except ImportError as e:
         "Install with: pip install aiohttp==3.9.1"
     ) from e
 
+from agents.http_session import PooledSessionMixin
+from utils import json_codec
 
-class PerplexityAgent:
+logger = logging.getLogger(__name__)
+
+# Citation patterns used while formatting every response
+_URL_RE = re.compile(r'https?://[^\s\)]+')
+_DOMAIN_RE = re.compile(r'https?://(?:www\.)?([^/]+)')
+
+# Response sections: one pass finds the bold headers, the first word picks
+# the section, and that section's pattern is matched at the header
+_SECTION_HEADER_RE = re.compile(
+    r'\*\*(Executive Summary|Key Findings?|Insights?(?:\s+&\s+Implications?)?)\*\*'
+)
+_HEADER_KIND = {
+    "executive": "summary",
+    "key": "findings",
+    "insight": "insights",
+    "insights": "insights",
+}
+_SECTION_RES = {
+    "summary": re.compile(
+        r'\*\*Executive Summary\*\*\s*\n\s*(.+?)(?:\n\n|\n\*\*)', re.DOTALL
+    ),
+    "findings": re.compile(
+        r'\*\*Key Findings?\*\*\s*\n\s*(.+?)(?:\n\n\*\*|\Z)', re.DOTALL
+    ),
+    "insights": re.compile(
+        r'\*\*Insights?(?:\s+&\s+Implications?)?\*\*\s*\n\s*(.+?)(?:\n\n\*\*|\Z)', re.DOTALL
+    ),
+}
+_FINDING_SPLIT_RE = re.compile(r'\n\s*[\-\*\d]+\.?\s+')
+
+
+@lru_cache(maxsize=1024)
+def _citation_domain(url: str) -> str:
+    """Return the host of a citation URL without ``www.``, or 'Source'."""
+    match = _DOMAIN_RE.search(url)
+    return match.group(1) if match else 'Source'
+
+
+_DOMAIN_FOCUS = {
+    "stocks": "Stock market data, financial metrics, earnings reports, analyst opinions, and market trends.",
+    "medical": "Peer-reviewed medical studies, clinical trials, treatment protocols, and regulatory updates.",
+    "academic": "Scholarly articles, research papers, academic publications, and peer-reviewed journals.",
+    "technology": "Technology developments, product launches, innovations, technical specifications, and industry trends.",
+    "general": "Comprehensive research across all relevant and credible sources."
+}
+
+
+class PerplexityAgent(PooledSessionMixin):
     """
     Perplexity research agent with domain-specific prompt loading
     """
     
+    # Raw prompt templates by domain (None when no prompt file exists),
+    # shared across instances so each file is read at most once per process
+    _PROMPT_CACHE: Dict[str, Optional[str]] = {}
+    
+    # Templates pre-split around the query placeholders, with the per-domain
+    # fields already substituted (None when str.format is still required)
+    _PROMPT_SEGMENTS: Dict[str, Optional[Tuple[str, ...]]] = {}
+    
     def __init__(self):
         self.api_key = os.getenv("PERPLEXITY_API_KEY")
         if not self.api_key:
@@ -38,6 +100,10 @@ class PerplexityAgent:
         self.cost_per_1k_input_tokens = 0.001
         self.cost_per_1k_output_tokens = 0.001
         
+        # Shared HTTP session, created lazily inside the running event loop
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        
     async def research(
         self,
         query: str,
@@ -57,7 +123,7 @@ class PerplexityAgent:
         Returns:
             Dictionary with research results, sources, and metrics
         """
-        print(f"   🌐 Perplexity Agent: Researching '{query}' in domain '{domain}'")
+        logger.debug("Perplexity Agent starting domain=%s query=%s", domain, query)
         
         # Load domain-specific prompt
         system_prompt = self._load_domain_prompt(domain, query)
@@ -82,22 +148,21 @@ class PerplexityAgent:
         
         # Execute API call
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.api_url,
-                    headers=headers,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=60)
-                ) as response:
-                    response.raise_for_status()
-                    data = await response.json()
+            async with self._get_session().post(
+                self.api_url,
+                headers=headers,
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=60)
+            ) as response:
+                response.raise_for_status()
+                data = json_codec.loads(await response.read())
             
             # Extract response with error handling
             try:
                 content = data['choices'][0]['message']['content']
             except (KeyError, IndexError, TypeError) as e:
-                print(f"   ❌ Perplexity: Invalid response structure: {e}")
-                print(f"   Response data: {data}")
+                logger.error("Perplexity: invalid response structure: %s", e)
+                logger.debug("Perplexity response data: %s", data)
                 return self._error_result(f"Invalid API response: {e}")
             
             # Extract citations - handle different formats
@@ -141,17 +206,20 @@ class PerplexityAgent:
                 "timestamp": datetime.now().isoformat()
             }
             
-            print(f"   ✅ Perplexity: {len(sources)} sources, {total_tokens} tokens, ${cost:.6f}")
+            logger.info(
+                "Perplexity: %d sources, %d tokens, $%.6f",
+                len(sources),
+                total_tokens,
+                cost
+            )
             
             return result
             
         except aiohttp.ClientError as e:
-            print(f"   ❌ Perplexity API error: {e}")
+            logger.error("Perplexity API error: %s", e)
             return self._error_result(str(e))
         except Exception as e:
-            print(f"   ❌ Perplexity error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Perplexity error: %s", e)
             return self._error_result(str(e))
     
     def _extract_citations(self, data: Dict[str, Any]) -> List[Any]:
@@ -191,8 +259,7 @@ class PerplexityAgent:
         try:
             content = data['choices'][0]['message']['content']
             if isinstance(content, str):
-                import re
-                urls = re.findall(r'https?://[^\s\)]+', content)
+                urls = _URL_RE.findall(content)
                 if urls:
                     return urls
         except (KeyError, IndexError, TypeError):
@@ -232,9 +299,7 @@ class PerplexityAgent:
                 elif isinstance(citation, str):
                     # Citation is a URL string
                     # Try to extract domain as title
-                    import re
-                    domain_match = re.search(r'https?://(?:www\.)?([^/]+)', citation)
-                    domain = domain_match.group(1) if domain_match else 'Source'
+                    domain = _citation_domain(citation)
                     
                     sources.append({
                         "title": f"{domain} - Source {idx}",
@@ -244,11 +309,11 @@ class PerplexityAgent:
                     })
                 else:
                     # Unknown format - skip
-                    print(f"   ⚠️ Unknown citation format: {type(citation)}")
+                    logger.warning("Unknown citation format: %s", type(citation))
                     continue
                     
             except Exception as e:
-                print(f"   ⚠️ Error formatting citation {idx}: {e}")
+                logger.warning("Error formatting citation %s: %s", idx, e)
                 continue
         
         # If no sources were extracted, create a generic one
@@ -277,16 +342,16 @@ class PerplexityAgent:
     
     def _load_domain_prompt(self, domain: str, query: str) -> str:
         """Load domain-specific prompt from prompts directory"""
-        domain_file = self.prompts_dir / f"perplexity_prompt_{domain}.txt"
-        
-        if not domain_file.exists():
-            domain_file = self.prompts_dir / "perplexity_prompt.txt"
+        template = self._get_prompt_template(domain)
         
-        if not domain_file.exists():
+        if template is None:
             return self._get_builtin_prompt(domain)
         
+        segments = self._get_prompt_segments(domain, template)
+        if segments is not None:
+            return query.join(segments)
+        
         try:
-            template = domain_file.read_text(encoding='utf-8')
             domain_focus = self._get_domain_focus(domain)
             
             prompt = template.format(
@@ -299,19 +364,74 @@ class PerplexityAgent:
             return prompt
             
         except Exception as e:
-            print(f"   ⚠️ Error loading prompt from {domain_file}: {e}")
+            logger.warning("Error formatting prompt for domain %r: %s", domain, e)
             return self._get_builtin_prompt(domain)
     
+    def _get_prompt_template(self, domain: str) -> Optional[str]:
+        """Return the raw prompt template for a domain, reading each file only once"""
+        if domain in self._PROMPT_CACHE:
+            return self._PROMPT_CACHE[domain]
+        
+        domain_file = self.prompts_dir / f"perplexity_prompt_{domain}.txt"
+        
+        if not domain_file.exists():
+            domain_file = self.prompts_dir / "perplexity_prompt.txt"
+        
+        template = None
+        if domain_file.exists():
+            try:
+                template = domain_file.read_text(encoding='utf-8')
+            except Exception as e:
+                logger.warning("Error loading prompt from %s: %s", domain_file, e)
+        
+        self._PROMPT_CACHE[domain] = template
+        return template
+    
+    def _get_prompt_segments(self, domain: str, template: str) -> Optional[Tuple[str, ...]]:
+        """
+        Split a template into the literal text between its query placeholders
+        
+        Rendering is then a single str.join. Templates using format specs,
+        conversions or unknown fields return None and go through str.format.
+        
+        Args:
+            domain: Research domain the template belongs to
+            template: Raw prompt template
+            
+        Returns:
+            Literal segments to join with the query, or None
+        """
+        if domain in self._PROMPT_SEGMENTS:
+            return self._PROMPT_SEGMENTS[domain]
+        
+        bound = {"domain": domain, "domain_focus": self._get_domain_focus(domain)}
+        segments = [""]
+        
+        try:
+            for literal, field, spec, conversion in string.Formatter().parse(template):
+                segments[-1] += literal
+                if field is None:
+                    continue
+                if spec or conversion:
+                    segments = None
+                    break
+                if field in bound:
+                    segments[-1] += bound[field]
+                elif field in ("query", "topic"):
+                    segments.append("")
+                else:
+                    segments = None
+                    break
+        except ValueError:
+            segments = None
+        
+        result = tuple(segments) if segments is not None else None
+        self._PROMPT_SEGMENTS[domain] = result
+        return result
+    
     def _get_domain_focus(self, domain: str) -> str:
         """Get domain-specific focus description"""
-        focuses = {
-            "stocks": "Stock market data, financial metrics, earnings reports, analyst opinions, and market trends.",
-            "medical": "Peer-reviewed medical studies, clinical trials, treatment protocols, and regulatory updates.",
-            "academic": "Scholarly articles, research papers, academic publications, and peer-reviewed journals.",
-            "technology": "Technology developments, product launches, innovations, technical specifications, and industry trends.",
-            "general": "Comprehensive research across all relevant and credible sources."
-        }
-        return focuses.get(domain, focuses["general"])
+        return _DOMAIN_FOCUS.get(domain, _DOMAIN_FOCUS["general"])
     
     def _get_builtin_prompt(self, domain: str) -> str:
         """Built-in fallback prompt if files not available"""
@@ -334,47 +454,40 @@ Use clear language, cite sources, and focus on credible information.
     
     def _parse_response(self, content: str) -> Dict[str, Any]:
         """Parse Perplexity response into structured sections"""
-        import re
-        
         result = {
             "summary": "",
             "findings": [],
             "insights": []
         }
         
+        sections: Dict[str, str] = {}
+        # Plain-prose answers have no bold headers; skip the section scan
+        if '**' in content:
+            for header in _SECTION_HEADER_RE.finditer(content):
+                kind = _HEADER_KIND[header.group(1).split(None, 1)[0].lower()]
+                if kind in sections:
+                    continue
+                match = _SECTION_RES[kind].match(content, header.start())
+                if match:
+                    sections[kind] = match.group(1)
+                if len(sections) == len(_SECTION_RES):
+                    break
+        
         # Extract summary
-        summary_match = re.search(
-            r'\*\*Executive Summary\*\*\s*\n\s*(.+?)(?:\n\n|\n\*\*)',
-            content,
-            re.DOTALL
-        )
-        if summary_match:
-            result["summary"] = summary_match.group(1).strip()
+        if "summary" in sections:
+            result["summary"] = sections["summary"].strip()
         else:
-            paragraphs = content.split('\n\n')
-            if paragraphs:
-                result["summary"] = paragraphs[0][:500]
+            # Only the first paragraph is needed, so split at most once
+            result["summary"] = content.split('\n\n', 1)[0][:500]
         
         # Extract findings
-        findings_match = re.search(
-            r'\*\*Key Findings?\*\*\s*\n\s*(.+?)(?:\n\n\*\*|\Z)',
-            content,
-            re.DOTALL
-        )
-        if findings_match:
-            findings_text = findings_match.group(1)
-            findings = re.split(r'\n\s*[\-\*\d]+\.?\s+', findings_text)
+        if "findings" in sections:
+            findings = _FINDING_SPLIT_RE.split(sections["findings"])
             result["findings"] = [f.strip() for f in findings if f.strip()][:5]
         
         # Extract insights
-        insights_match = re.search(
-            r'\*\*Insights?(?:\s+&\s+Implications?)?\*\*\s*\n\s*(.+?)(?:\n\n\*\*|\Z)',
-            content,
-            re.DOTALL
-        )
-        if insights_match:
-            insights_text = insights_match.group(1)
-            insights = [s.strip() for s in insights_text.split('\n') if s.strip()]
+        if "insights" in sections:
+            insights = [s.strip() for s in sections["insights"].split('\n') if s.strip()]
             result["insights"] = insights[:3]
         
         return result
\ No newline at end of file
@@ -4,22 +4,30 @@ Using YouTube Data API v3 Only - NO FFmpeg dependencies
 """
 from __future__ import annotations
 
-import json
+import hashlib
 import logging
+import os
+import threading
 import time
-import re
-from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Tuple, Optional
 
-import requests
-from requests import Session
+import urllib3
+from urllib3.exceptions import HTTPError
+from urllib3.util import Retry, Timeout
 
 from graph.state import ResearchState
+from utils import json_codec
 from utils.config_loader import get_youtube_api_key
-from utils.llm_registry import invoke_llm, zero_metrics
-from utils.structured_data import build_structured_record
+from utils.llm_registry import LLMCallMetrics, invoke_llm, zero_metrics
+from utils.prompt_cache import get_prompt_cache
+from utils.semantic_cache import get_semantic_cache
+from utils.structured_data import build_structured_records
+from utils.yt_details_cache import get_details_cache
 
 DATA_DIR = Path(__file__).resolve().parents[2] / "data" / "youtube"
 DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -31,6 +39,27 @@ _PUBLISHED_AFTER_DAYS = 365
 _MAX_RESULTS_SIMPLE = 3
 _MAX_RESULTS_EXTENDED = 5
 _SUMMARY_MAX_CHARS = 2000
+_SUMMARY_WORKERS = 8  # concurrent LLM calls per run
+_SHORT_CONTENT_CHARS = 200  # title + description below this skip the LLM
+_LOW_INFO_CHARS = 80  # description + tag text below this skip the LLM
+_PROMPT_CACHE_PATH = DATA_DIR / ".prompt_cache.sqlite"
+_DETAILS_CACHE_PATH = DATA_DIR / ".details_cache.sqlite"
+_SEARCH_CACHE_DIR = DATA_DIR / "api_cache"
+_search_cache_swept_day: Optional[str] = None  # last UTC day pruned
+_SEMANTIC_CACHE_PATH = DATA_DIR / ".semantic_cache.sqlite"
+_SEMANTIC_KEY_CHARS = 500  # description excerpt used for similarity lookup
+_REQUEST_TIMEOUT = Timeout(connect=3.05, read=15)
+_DETAILS_BATCH_SIZE = 50  # videos endpoint accepts at most 50 IDs per call
+
+# Partial-response selectors: only the fields read below are returned
+_SEARCH_FIELDS = (
+    "items(id/videoId,snippet(title,description,channelTitle,channelId,"
+    "publishedAt,thumbnails/high/url))"
+)
+_DETAILS_FIELDS = (
+    "items(id,contentDetails/duration,statistics(viewCount,likeCount,commentCount),"
+    "snippet(description,tags,categoryId,defaultLanguage))"
+)
 
 _SUMMARY_PROMPT_PATH = Path(__file__).resolve().parents[1] / 'prompts' / 'youtube_summary_prompt.txt'
 _DEFAULT_SUMMARY_PROMPT = (
@@ -43,34 +72,140 @@ _DEFAULT_SUMMARY_PROMPT = (
     'Focus on key insights, main topics covered, and potential value for research.'
 )
 
-_session: Optional[Session] = None
+# One request for several videos: each task is the per-video summary prompt,
+# and the model answers with a JSON array holding one answer per task
+_BATCH_SUMMARY_PROMPT = (
+    'Below are {count} separate YouTube video summarisation tasks, each with its own instructions.\n'
+    'Complete every task. Respond with only a JSON array of {count} strings, '
+    'one answer per task, in the order given.\n\n'
+    '{videos}'
+)
+_BATCH_VIDEO_ENTRY = '### Task {index}\n{prompt}\n'
 
+# Resolved once at import; the template does not change during a process
+try:
+    _SUMMARY_PROMPT = _SUMMARY_PROMPT_PATH.read_text(encoding="utf-8")
+except OSError:
+    _SUMMARY_PROMPT = _DEFAULT_SUMMARY_PROMPT
+
+# Run metadata is written off the request path; the caller does not wait on disk I/O.
+# One worker keeps each run's appended records in order.
+_metadata_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="yt-metadata")
+
+_http: Optional[urllib3.PoolManager] = None
+
+
+@dataclass(slots=True)
+class _PreparedVideo:
+    """Per-video fields gathered from the search and details responses."""
+
+    video_id: str
+    title: str
+    channel: str
+    metadata: Dict[str, Any]
+    duration: str
+    views: str
+    tags: List[str]
+    full_description: str
+    url: str
+
+
+def _get_http() -> urllib3.PoolManager:
+    """Return a singleton connection pool for YouTube API calls.
+    
+    The endpoints only take JSON GETs, so urllib3 is used directly rather
+    than going through a requests.Session.
+    """
+    global _http
+    if _http is None:
+        # Larger pool for concurrent calls; transient 429/5xx are retried with backoff
+        _http = urllib3.PoolManager(
+            num_pools=4,
+            maxsize=32,
+            headers={"Accept": "application/json"},
+            retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["GET"],
+            ),
+        )
+    return _http
 
-@lru_cache(maxsize=1)
-def _load_summary_prompt() -> str:
-    """Load the YouTube summary prompt template, cached across runs."""
-    if _SUMMARY_PROMPT_PATH.exists():
-        return _SUMMARY_PROMPT_PATH.read_text(encoding="utf-8")
-    return _DEFAULT_SUMMARY_PROMPT
 
+def close_session() -> None:
+    """Close the shared connection pool so pooled connections are released."""
+    global _http
+    if _http is not None:
+        _http.clear()
+        _http = None
 
-def _get_session() -> Session:
-    """Return a singleton HTTP session for YouTube API calls."""
-    global _session
-    if _session is None:
-        _session = Session()
-        _session.headers.update({"Accept": "application/json"})
-    return _session
+
+def _get_json(url: str, params: Dict[str, Any]) -> Any:
+    """GET *url* with query *params* and decode the JSON body."""
+    response = _get_http().request("GET", url, fields=params, timeout=_REQUEST_TIMEOUT)
+    if response.status >= 400:
+        raise HTTPError(f"YouTube API returned HTTP {response.status} for {url}")
+    return json_codec.loads(response.data)
+
+
+@lru_cache(maxsize=1)
+def _published_after(day_bucket: int) -> str:
+    """Return the search publishedAfter bound for a UTC day number."""
+    return (datetime.utcnow() - timedelta(days=_PUBLISHED_AFTER_DAYS)).isoformat() + "Z"
 
 
 def _search_videos(
     api_key: str, 
     query: str, 
     max_results: int,
-    extra_factor: int = 3
 ) -> List[Dict[str, Any]]:
-    """Search YouTube videos using Data API v3."""
-    session = _get_session()
+    """Search YouTube videos, reusing results for the same query from the same UTC day."""
+    day = time.strftime('%Y%m%d', time.gmtime())
+    cache_key = f"{day}_" + hashlib.sha1(f"{query}|{max_results}".encode("utf-8")).hexdigest()
+    cache_file = _SEARCH_CACHE_DIR / f"{cache_key}.json"
+    
+    if cache_file.exists():
+        try:
+            return json_codec.loads(cache_file.read_bytes())
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable search cache %s: %s", cache_file, exc)
+    
+    results = _request_search(api_key, query, max_results)
+    
+    # Write-then-rename so concurrent runs never read a partial file
+    try:
+        _SEARCH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_name(f"{cache_key}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_file.write_bytes(json_codec.dumps(results))
+        os.replace(tmp_file, cache_file)
+    except OSError as exc:
+        logger.warning("Could not write search cache %s: %s", cache_file, exc)
+    
+    _prune_search_cache(day)
+    return results
+
+
+def _prune_search_cache(day: str) -> None:
+    """Delete search cache files from earlier UTC days, once per day."""
+    global _search_cache_swept_day
+    if _search_cache_swept_day == day:
+        return
+    _search_cache_swept_day = day
+    
+    try:
+        stale_files = [path for path in _SEARCH_CACHE_DIR.iterdir() if not path.name.startswith(f"{day}_")]
+    except OSError:
+        return
+    for path in stale_files:
+        try:
+            path.unlink()
+        except OSError as exc:
+            logger.debug("Could not remove stale search cache %s: %s", path, exc)
+
+
+def _request_search(api_key: str, query: str, max_results: int) -> List[Dict[str, Any]]:
+    """Call the Data API v3 search endpoint."""
     url = "https://www.googleapis.com/youtube/v3/search"
     
     params = {
@@ -78,86 +213,124 @@ def _search_videos(
         "q": query,
         "type": "video",
         "key": api_key,
-        "maxResults": max_results * extra_factor,
+        "maxResults": max_results,
         "relevanceLanguage": "en",
         "order": "relevance",
         "safeSearch": "none",
         "videoEmbeddable": "true",
-        "publishedAfter": (
-            datetime.utcnow() - timedelta(days=_PUBLISHED_AFTER_DAYS)
-        ).isoformat() + "Z",
+        "publishedAfter": _published_after(int(time.time()) // 86400),
+        "fields": _SEARCH_FIELDS,
     }
     
-    response = session.get(url, params=params, timeout=30)
-    response.raise_for_status()
-    data = response.json()
+    data = _get_json(url, params)
     
-    results = []
-    for item in data.get("items", []):
-        video_id = item["id"].get("videoId")
-        snippet = item.get("snippet", {})
-        
-        results.append({
-            "video_id": video_id,
-            "title": snippet.get("title", ""),
-            "description": snippet.get("description", ""),
-            "channel": snippet.get("channelTitle", ""),
-            "channel_id": snippet.get("channelId", ""),
-            "published_at": snippet.get("publishedAt", ""),
-            "thumbnail": snippet.get("thumbnails", {}).get("high", {}).get("url", ""),
-        })
-    
-    return results
+    return [
+        {
+            "video_id": item["id"].get("videoId"),
+            "title": snippet_get("title", ""),
+            "description": snippet_get("description", ""),
+            "channel": snippet_get("channelTitle", ""),
+            "channel_id": snippet_get("channelId", ""),
+            "published_at": snippet_get("publishedAt", ""),
+            "thumbnail": (snippet_get("thumbnails") or {}).get("high", {}).get("url", ""),
+        }
+        for item in data.get("items", [])
+        for snippet_get in ((item.get("snippet") or {}).get,)
+    ]
 
 
 def _fetch_video_details(api_key: str, video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
-    """Fetch detailed information for video IDs."""
+    """Fetch detailed information for video IDs, reusing details cached in the last day."""
     if not video_ids:
         return {}
     
-    session = _get_session()
+    details_cache = get_details_cache(_DETAILS_CACHE_PATH)
+    details = details_cache.get_many(video_ids)
+    
+    fresh_ids = [video_id for video_id in video_ids if video_id not in details]
+    if fresh_ids:
+        chunks = [
+            fresh_ids[i:i + _DETAILS_BATCH_SIZE]
+            for i in range(0, len(fresh_ids), _DETAILS_BATCH_SIZE)
+        ]
+        if len(chunks) == 1:
+            fetched = _request_video_details(api_key, chunks[0])
+        else:
+            fetched = {}
+            with ThreadPoolExecutor(max_workers=min(len(chunks), _SUMMARY_WORKERS)) as executor:
+                for chunk_details in executor.map(
+                    lambda chunk: _request_video_details(api_key, chunk), chunks
+                ):
+                    fetched.update(chunk_details)
+        details_cache.set_many(fetched)
+        details.update(fetched)
+    
+    return details
+
+
+def _request_video_details(api_key: str, video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Call the videos endpoint for video IDs."""
     url = "https://www.googleapis.com/youtube/v3/videos"
     
     params = {
         "part": "snippet,contentDetails,statistics",
         "id": ",".join(video_ids),
         "key": api_key,
+        "fields": _DETAILS_FIELDS,
     }
     
-    response = session.get(url, params=params, timeout=30)
-    response.raise_for_status()
-    data = response.json()
+    data = _get_json(url, params)
     
-    details = {}
-    for item in data.get("items", []):
-        video_id = item["id"]
-        snippet = item.get("snippet", {})
-        content = item.get("contentDetails", {})
-        stats = item.get("statistics", {})
-        
-        details[video_id] = {
-            "duration": content.get("duration", "PT0S"),
-            "views": stats.get("viewCount", "0"),
-            "likes": stats.get("likeCount", "0"),
-            "comments": stats.get("commentCount", "0"),
-            "description": snippet.get("description", ""),
-            "tags": snippet.get("tags", []),
-            "category_id": snippet.get("categoryId", ""),
-            "default_language": snippet.get("defaultLanguage", ""),
+    return {
+        item["id"]: {
+            "duration": content_get("duration", "PT0S"),
+            "views": stats_get("viewCount", "0"),
+            "likes": stats_get("likeCount", "0"),
+            "comments": stats_get("commentCount", "0"),
+            "description": snippet_get("description", ""),
+            "tags": snippet_get("tags", []),
+            "category_id": snippet_get("categoryId", ""),
+            "default_language": snippet_get("defaultLanguage", ""),
         }
-    
-    return details
+        for item in data.get("items", [])
+        for snippet_get, content_get, stats_get in (
+            (
+                (item.get("snippet") or {}).get,
+                (item.get("contentDetails") or {}).get,
+                (item.get("statistics") or {}).get,
+            ),
+        )
+    }
 
 
 def _format_duration(iso_duration: str) -> str:
     """Convert ISO 8601 duration to human-readable format."""
-    match = re.match(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?', iso_duration)
-    if not match:
+    if not iso_duration.startswith("P"):
         return "Unknown"
     
-    hours = int(match.group(1) or 0)
-    minutes = int(match.group(2) or 0)
-    seconds = int(match.group(3) or 0)
+    # Single pass over the handful of characters after "P"; day and week
+    # components (long streams) are folded into hours, fractional seconds
+    # are truncated
+    hours = minutes = seconds = value = 0
+    in_fraction = False
+    for char in iso_duration[1:]:
+        if "0" <= char <= "9":
+            if not in_fraction:
+                value = value * 10 + ord(char) - 48
+        elif char == "T":
+            value = 0
+        elif char == ".":
+            in_fraction = True
+        elif char == "W":
+            hours, value = hours + value * 168, 0
+        elif char == "D":
+            hours, value = hours + value * 24, 0
+        elif char == "H":
+            hours, value = hours + value, 0
+        elif char == "M":
+            minutes, value = value, 0
+        elif char == "S":
+            seconds, value, in_fraction = value, 0, False
     
     if hours > 0:
         return f"{hours}h {minutes}m"
@@ -167,7 +340,55 @@ def _format_duration(iso_duration: str) -> str:
         return f"{seconds}s"
 
 
-def _summarize_video(
+def _zero_metrics_dict() -> Dict[str, Any]:
+    """Metrics for a summary produced without an LLM call."""
+    return _metrics_dict(zero_metrics("youtube_summarizer"))
+
+
+def _metrics_dict(llm_metrics: LLMCallMetrics) -> Dict[str, Any]:
+    """Usage fields of an LLM call as the dict carried through a run."""
+    return {
+        "total_tokens": llm_metrics.total_tokens,
+        "cost": llm_metrics.cost,
+        "prompt_tokens": llm_metrics.prompt_tokens,
+        "completion_tokens": llm_metrics.completion_tokens
+    }
+
+
+def _fallback_summary(title: str, channel: str, views: str, duration: str) -> str:
+    """Plain metadata summary used when the LLM cannot be reached."""
+    return f"Video: {title}\nChannel: {channel}\nViews: {views}\nDuration: {duration}"
+
+
+def _append_metadata(path: Path, record: Dict[str, Any]) -> None:
+    """Append one processed video's metadata to the run's JSON Lines file."""
+    try:
+        with path.open("ab") as f:
+            f.write(json_codec.dumps(record) + b"\n")
+    except OSError as exc:
+        logger.warning("Could not write YouTube metadata %s: %s", path, exc)
+
+
+def _log_metadata_failure(future: Future) -> None:
+    """Log an unexpected error from a background metadata write."""
+    exc = future.exception()
+    if exc is not None:
+        logger.error("YouTube metadata write failed: %s", exc)
+
+
+def _metadata_only_summary(
+    title: str, channel: str, description: str, tags: List[str]
+) -> Optional[str]:
+    """Summary built from metadata alone when a video has too little text for the LLM."""
+    if len(title) + len(description) < _SHORT_CONTENT_CHARS:
+        return f"{title}. {description}".strip()
+    if len(description) + sum(len(tag) for tag in tags[:10]) < _LOW_INFO_CHARS:
+        tag_text = f" Tags: {', '.join(tags[:5])}." if tags else ""
+        return f"{title} — {channel}.{tag_text}"
+    return None
+
+
+def _video_prompt(
     title: str,
     channel: str,
     description: str,
@@ -175,29 +396,71 @@ def _summarize_video(
     tags: List[str],
     views: str,
     duration: str,
-) -> Tuple[str, Dict[str, Any]]:
-    """Generate summary from video metadata using LLM."""
-    
-    prompt_template = _load_summary_prompt()
-    
-    # Truncate description if needed
-    truncated_desc = description[:_SUMMARY_MAX_CHARS]
-    if len(description) > _SUMMARY_MAX_CHARS:
-        truncated_desc += "..."
-    
-    # Format tags
-    tags_str = ", ".join(tags[:10]) if tags else "None"
-    
-    # Build prompt
-    prompt = prompt_template.format(
+) -> str:
+    """Render the per-video summary prompt from the prompt template."""
+    truncated_desc = (
+        description[:_SUMMARY_MAX_CHARS] + "..."
+        if len(description) > _SUMMARY_MAX_CHARS
+        else description
+    )
+    return _SUMMARY_PROMPT.format(
         title=title,
         channel=channel,
         url=url,
         description=truncated_desc,
-        tags=tags_str,
+        tags=", ".join(tags[:10]) if tags else "None",
         views=views,
         duration=duration
     )
+
+
+def _cached_summary(prompt: str, title: str, description: str) -> Tuple[Optional[str], Any]:
+    """Look a video up in the prompt cache, then the semantic cache.
+    
+    Returns the cached summary (or None) and the video's embedding, which
+    is None when the semantic cache is disabled or the prompt cache hit.
+    """
+    # Identical prompts from earlier runs are answered without an LLM call
+    cached = get_prompt_cache(_PROMPT_CACHE_PATH).get(prompt)
+    if cached is not None:
+        return cached[0], None
+    
+    # Near-duplicate videos from earlier runs reuse their cached summary
+    semantic_cache = get_semantic_cache(_SEMANTIC_CACHE_PATH)
+    if semantic_cache is None:
+        return None, None
+    embedding = semantic_cache.embed(f"{title}\n{description[:_SEMANTIC_KEY_CHARS]}")
+    return semantic_cache.lookup(embedding), embedding
+
+
+def _store_summary(prompt: str, summary: str, metrics_dict: Dict[str, Any], embedding: Any) -> None:
+    """Record a fresh summary under its per-video prompt and embedding."""
+    if embedding is not None:
+        get_semantic_cache(_SEMANTIC_CACHE_PATH).store(embedding, summary)
+    get_prompt_cache(_PROMPT_CACHE_PATH).set(prompt, summary, metrics_dict)
+
+
+def _summarize_video(
+    title: str,
+    channel: str,
+    description: str,
+    url: str,
+    tags: List[str],
+    views: str,
+    duration: str,
+) -> Tuple[str, Dict[str, Any]]:
+    """Generate summary from video metadata using LLM."""
+    
+    # Too little text to be worth a model call; the metadata is the summary
+    metadata_summary = _metadata_only_summary(title, channel, description, tags)
+    if metadata_summary is not None:
+        return metadata_summary, _zero_metrics_dict()
+    
+    prompt = _video_prompt(title, channel, description, url, tags, views, duration)
+    
+    cached_summary, embedding = _cached_summary(prompt, title, description)
+    if cached_summary is not None:
+        return cached_summary, _zero_metrics_dict()
     
     # Get summary from LLM
     # FIXED: invoke_llm(name, prompt) - correct parameter order
@@ -206,25 +469,79 @@ def _summarize_video(
         summary_text = response.content if hasattr(response, 'content') else str(response)
         
         # Return summary and metrics dictionary
-        metrics_dict = {
-            "total_tokens": llm_metrics.total_tokens,
-            "cost": llm_metrics.cost,
-            "prompt_tokens": llm_metrics.prompt_tokens,
-            "completion_tokens": llm_metrics.completion_tokens
-        }
+        metrics_dict = _metrics_dict(llm_metrics)
+        _store_summary(prompt, summary_text, metrics_dict, embedding)
         return summary_text, metrics_dict
         
     except Exception as exc:
-        logger.warning(f"Failed to summarize video: {exc}")
-        fallback = f"Video: {title}\nChannel: {channel}\nViews: {views}\nDuration: {duration}"
-        # FIXED: zero_metrics requires name parameter
-        zero_m = zero_metrics("youtube_summarizer")
-        return fallback, {
-            "total_tokens": zero_m.total_tokens,
-            "cost": zero_m.cost,
-            "prompt_tokens": zero_m.prompt_tokens,
-            "completion_tokens": zero_m.completion_tokens
-        }
+        logger.warning("Failed to summarize video: %s", exc)
+        return _fallback_summary(title, channel, views, duration), _zero_metrics_dict()
+
+
+def _summarize_videos_batch(
+    infos: List[_PreparedVideo],
+) -> List[Optional[Tuple[str, Dict[str, Any]]]]:
+    """Summarize several prepared videos, sending only cache misses to the LLM.
+    
+    Each video is first looked up in the prompt and semantic caches under
+    its own per-video prompt; the misses are answered together in one call
+    and each answer is cached under its video's prompt and embedding. The
+    batch metrics are attributed to the first miss and the rest get zero
+    metrics, so run totals stay correct. Entries are None where the batch
+    call failed or its reply was not a JSON array of the expected length,
+    so the caller can fall back to per-video summaries.
+    """
+    results: List[Optional[Tuple[str, Dict[str, Any]]]] = [None] * len(infos)
+    misses = []
+    for index, info in enumerate(infos):
+        prompt = _video_prompt(
+            info.title, info.channel, info.full_description, info.url,
+            info.tags, info.views, info.duration,
+        )
+        cached_summary, embedding = _cached_summary(prompt, info.title, info.full_description)
+        if cached_summary is not None:
+            results[index] = (cached_summary, _zero_metrics_dict())
+        else:
+            misses.append((index, prompt, embedding))
+    
+    # A lone miss goes through the per-video path in the caller
+    if len(misses) < 2:
+        return results
+    
+    batch_prompt = _BATCH_SUMMARY_PROMPT.format(
+        count=len(misses),
+        videos="\n".join(
+            _BATCH_VIDEO_ENTRY.format(index=number, prompt=prompt)
+            for number, (_, prompt, _) in enumerate(misses, 1)
+        ),
+    )
+    try:
+        response, llm_metrics = invoke_llm("youtube_summarizer", batch_prompt)
+    except Exception as exc:
+        logger.warning("Batch video summarization failed: %s", exc)
+        return results
+    reply = response.content if hasattr(response, 'content') else str(response)
+    
+    # Tolerate prose or code fences around the array
+    start, end = reply.find("["), reply.rfind("]")
+    try:
+        summaries = json_codec.loads(reply[start:end + 1]) if 0 <= start < end else None
+    except ValueError:
+        summaries = None
+    if (
+        not isinstance(summaries, list)
+        or len(summaries) != len(misses)
+        or not all(isinstance(summary, str) for summary in summaries)
+    ):
+        logger.warning("Batch video summary reply was not a JSON array of %d strings", len(misses))
+        return results
+    
+    batch_metrics = _metrics_dict(llm_metrics)
+    for position, ((index, prompt, embedding), summary) in enumerate(zip(misses, summaries)):
+        metrics_dict = batch_metrics if position == 0 else _zero_metrics_dict()
+        _store_summary(prompt, summary, metrics_dict, embedding)
+        results[index] = (summary, metrics_dict)
+    return results
 
 
 # FIXED: Function name changed from research_youtube_videos to analyze_youtube
@@ -245,7 +562,7 @@ def analyze_youtube(state: ResearchState) -> dict:
     topic = state.get("topic") or state.get("research_topic", "")
     mode = state.get("mode", "simple")
     
-    logger.info(f"Analyzing YouTube videos for topic: {topic} (mode={mode})")
+    logger.info("Analyzing YouTube videos for topic: %s (mode=%s)", topic, mode)
     
     api_key = get_youtube_api_key()
     
@@ -268,8 +585,7 @@ def analyze_youtube(state: ResearchState) -> dict:
     
     # Search for videos
     try:
-        search_results = _search_videos(api_key, topic, max_results, extra_factor=3)
-        search_results.sort(key=lambda item: item.get("published_at", ""), reverse=True)
+        search_results = _search_videos(api_key, topic, max_results)
     except Exception as exc:
         elapsed = time.time() - start
         logger.exception("YouTube search failed")
@@ -286,7 +602,9 @@ def analyze_youtube(state: ResearchState) -> dict:
         }
     
     # Get detailed video information
-    video_ids = [item["video_id"] for item in search_results]
+    # Only the first max_results videos are summarized, so only they need details
+    videos = search_results[:max_results]
+    video_ids = [item["video_id"] for item in videos]
     try:
         video_details = _fetch_video_details(api_key, video_ids)
     except Exception as exc:
@@ -294,62 +612,116 @@ def analyze_youtube(state: ResearchState) -> dict:
         video_details = {}
     
     # Create output directory
-    run_id = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+    run_id = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
     run_dir = DATA_DIR / run_id
     run_dir.mkdir(parents=True, exist_ok=True)
     
     summaries: List[Dict[str, Any]] = []
-    metadata_records: List[Dict[str, Any]] = []
     total_tokens = 0
     total_cost = 0.0
     
-    # Process each video
-    for video in search_results[:max_results]:
+    # Format video metadata up front so summaries can be requested concurrently
+    prepared: List[_PreparedVideo] = []
+    for video in videos:
         video_id = video["video_id"]
         metadata = video_details.get(video_id, {})
         
-        # Format video metadata
         duration_iso = metadata.get("duration", "PT0S")
-        duration = _format_duration(duration_iso)
-        views = metadata.get("views", "0")
-        tags = metadata.get("tags", [])
-        full_description = metadata.get("description", video.get("description", ""))
-        
-        url = f"https://www.youtube.com/watch?v={video_id}"
-        
-        # Generate summary using LLM
-        summary_text, llm_metrics = _summarize_video(
+        prepared.append(_PreparedVideo(
+            video_id=video_id,
             title=video["title"],
             channel=video["channel"],
-            description=full_description,
-            url=url,
-            tags=tags,
-            views=views,
-            duration=duration,
-        )
-        
+            metadata=metadata,
+            duration=_format_duration(duration_iso),
+            views=metadata.get("views", "0"),
+            tags=metadata.get("tags", []),
+            full_description=metadata.get("description", video.get("description", "")),
+            url=f"https://www.youtube.com/watch?v={video_id}",
+        ))
+    
+    summary_results: List[Optional[Tuple[str, Dict[str, Any]]]] = [None] * len(prepared)
+    
+    # Videos that need the LLM are answered from the caches or summarized
+    # together in a single request
+    batch_indices = [
+        index for index, info in enumerate(prepared)
+        if _metadata_only_summary(
+            info.title, info.channel, info.full_description, info.tags
+        ) is None
+    ]
+    if len(batch_indices) > 1:
+        batched = _summarize_videos_batch([prepared[index] for index in batch_indices])
+        for index, result in zip(batch_indices, batched):
+            summary_results[index] = result
+    
+    # Anything left (short videos, or a failed batch) is summarized per video.
+    # Those LLM calls are I/O-bound and independent, so overlap them (capped
+    # to avoid rate-limit bursts); results are stored by position to keep the
+    # search ranking, and one failure does not sink the others
+    pending = [index for index, result in enumerate(summary_results) if result is None]
+    if pending:
+        with ThreadPoolExecutor(max_workers=min(len(pending), _SUMMARY_WORKERS)) as executor:
+            futures = [
+                executor.submit(
+                    _summarize_video,
+                    title=info.title,
+                    channel=info.channel,
+                    description=info.full_description,
+                    url=info.url,
+                    tags=info.tags,
+                    views=info.views,
+                    duration=info.duration,
+                )
+                for info in (prepared[index] for index in pending)
+            ]
+            for index, future in zip(pending, futures):
+                info = prepared[index]
+                try:
+                    summary_results[index] = future.result()
+                except Exception as exc:
+                    logger.warning("Summarization failed for video %s: %s", info.video_id, exc)
+                    summary_results[index] = (
+                        _fallback_summary(info.title, info.channel, info.views, info.duration),
+                        _zero_metrics_dict(),
+                    )
+    
+    metadata_file = run_dir / "metadata.jsonl"
+    record_fields: List[Dict[str, Any]] = []
+    
+    # Process each video
+    for video, info, (summary_text, llm_metrics) in zip(videos, prepared, summary_results):
+        video_id = info.video_id
+        title = info.title
+        channel = info.channel
+        published_at = video.get("published_at", "")
+        metadata = info.metadata
+        duration = info.duration
+        views = info.views
+        tags = info.tags
+        full_description = info.full_description
+        url = info.url
+    
         # Track costs - llm_metrics is now a dict
         total_tokens += llm_metrics.get("total_tokens", 0)
         total_cost += llm_metrics.get("cost", 0.0)
-        
+    
         # FIXED: Use correct parameter name 'source' instead of 'url'
         # Also removed non-existent parameters 'source_type' and 'medium'
-        record = build_structured_record(
-            title=video["title"],
-            source=url,
-            summary=summary_text,
-            content=summary_text,
-            published_date=video.get("published_at"),
-            authors=[video["channel"]]
-        )
-        summaries.append(record)
-        
+        record_fields.append({
+            "title": title,
+            "source": url,
+            "summary": summary_text,
+            "content": summary_text,
+            "published_date": published_at,
+            "authors": [channel],
+        })
+    
         # Store metadata
         meta_rec = {
-            "title": video["title"],
-            "channel": video["channel"],
+            "title": title,
+            "channel": channel,
             "url": url,
-            "published_at": video.get("published_at", ""),
+            "published_at": published_at,
             "video_id": video_id,
             "channel_id": video.get("channel_id", ""),
             "duration": duration,
@@ -362,16 +734,17 @@ def analyze_youtube(state: ResearchState) -> dict:
             "category_id": metadata.get("category_id", ""),
             "language": metadata.get("default_language", "unknown"),
         }
-        metadata_records.append(meta_rec)
+        # Each record is handed to the writer as it is produced, so run memory
+        # stays flat; failures are logged from the callback
+        _metadata_writer.submit(_append_metadata, metadata_file, meta_rec).add_done_callback(
+            _log_metadata_failure
+        )
+    
+    summaries.extend(build_structured_records(record_fields))
     
     # Save results
     elapsed = time.time() - start
     
-    # Save metadata to JSON
-    metadata_file = run_dir / "metadata.json"
-    with open(metadata_file, "w", encoding="utf-8") as f:
-        json.dump(metadata_records, f, indent=2, ensure_ascii=False)
-    
     logger.info(
         "YouTube analysis complete: %d videos, %.2fs, %d tokens, $%.4f",
         len(summaries),
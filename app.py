@@ -4,23 +4,33 @@ Multi-Agent AI Research Platform - FIXED VERSION
 """
 
 import streamlit as st
-import json
 from datetime import datetime
+from itertools import chain
 import time
-import asyncio
 from pathlib import Path
 import sys
+import uuid
 
 # Import modular components
 from research_engine import execute_research, PERPLEXITY_MODELS
+from results_display import display_results
 from utils import (
     console_log,
     calculate_confidence_score,
     save_history_to_json,
     load_history_from_json,
+    load_archived_history,
+    persist_result,
+    resolve_history_item,
+    clear_persisted_results,
+    trim_history,
     generate_comprehensive_pdf,
+    json_codec,
     PDF_AVAILABLE
 )
+from utils.logger import configure_logging
+
+configure_logging()
 
 # Page configuration
 st.set_page_config(
@@ -222,6 +232,70 @@ st.markdown("""
 if not st.session_state.research_history:
     load_history_from_json()
 
+def build_agent_row(agent_name, result):
+    """
+    Build the per-agent performance row stored in results['agent_data']
+    """
+    if result.get('success'):
+        return {
+            "agent_name": agent_name,
+            "source_count": result.get('source_count', 0),
+            "sources_retrieved": result.get('sources_retrieved', 0),
+            "findings_count": len(result.get('findings', [])),
+            "insights_count": len(result.get('insights', [])),
+            "cost": result.get('cost', 0.0),
+            "tokens": result.get('tokens', 0),
+            "prompt_tokens": result.get('prompt_tokens', 0),
+            "completion_tokens": result.get('completion_tokens', 0),
+            "execution_time": result.get('execution_time', 0.0),
+            "status": result.get('status', 'Unknown'),
+            "model_used": result.get('model_used', 'N/A'),
+            "model_type": result.get('model_type', 'N/A'),
+            "medium": result.get('medium', 'N/A'),
+            "data_type": result.get('data_type', 'N/A')
+        }
+    return {
+        "agent_name": agent_name,
+        "source_count": 0,
+        "sources_retrieved": 0,
+        "findings_count": 0,
+        "insights_count": 0,
+        "cost": 0.0,
+        "tokens": 0,
+        "execution_time": result.get('execution_time', 0.0),
+        "status": result.get('status', "❌ Failed"),
+        "error": result.get('error', 'Unknown error'),
+        "medium": result.get('medium', 'N/A')
+    }
+
+def restore_history_item(item):
+    """
+    Restore complete state from a history item
+    """
+    # Older history files embed the full results; newer ones only keep a key
+    results = resolve_history_item(item).get('results')
+    if results is None:
+        st.warning("⚠️ The saved results for this history item could not be loaded.")
+        return False
+    
+    st.session_state.current_results = results
+    st.session_state.current_query = item['query']
+    st.session_state.current_domain = item['domain']
+    st.session_state.current_agents = item.get('agents_state', {})
+    st.session_state.market_model_type = item.get('model_type', 'Quick Search')
+    st.session_state.market_sources = item.get('market_sources', 2)
+    st.session_state.sentiment_sources = item.get('sentiment_sources', 2)
+    st.session_state.data_sources = item.get('data_sources', 2)
+    console_log(f"📂 Restored history item: {item['query'][:40]}")
+    return True
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def build_history_export(history_keys, _history):
+    """
+    Serialize the history with each item's full results resolved from disk
+    """
+    return json_codec.dumps([resolve_history_item(item) for item in _history], indent=True)
+
 # ============================================================================
 # SIDEBAR WITH FIXED HISTORY DISPLAY
 # ============================================================================
@@ -244,22 +318,18 @@ with st.sidebar:
             button_label = f"📄 {query_display}\n🕒 {item['timestamp'][:16]}\n🔬 {item.get('model_type', 'N/A')[:20]}\n📊 {domain_display}"
             
             if st.button(button_label, key=history_key, width='stretch'):
-                # Restore complete state from history
-                st.session_state.current_results = item['results']
-                st.session_state.current_query = item['query']
-                st.session_state.current_domain = item['domain']
-                st.session_state.current_agents = item.get('agents_state', {})
-                st.session_state.market_model_type = item.get('model_type', 'Quick Search')
-                st.session_state.market_sources = item.get('market_sources', 2)
-                st.session_state.sentiment_sources = item.get('sentiment_sources', 2)
-                st.session_state.data_sources = item.get('data_sources', 2)
-                console_log(f"📂 Restored history item: {item['query'][:40]}")
-                st.rerun()
+                if restore_history_item(item):
+                    st.rerun()
         
         st.markdown("---")
         
         # Download Complete History JSON
-        history_json = json.dumps(st.session_state.research_history, indent=2, ensure_ascii=False)
+        # Items only hold a result_id, so resolve the payloads for a complete export;
+        # cached on the item keys so files are read once per history state
+        history_keys = tuple(
+            (item['timestamp'], item.get('result_id')) for item in st.session_state.research_history
+        )
+        history_json = build_history_export(history_keys, st.session_state.research_history)
         st.download_button(
             "📥 Download Complete History",
             history_json,
@@ -272,6 +342,22 @@ with st.sidebar:
         # FIXED: This should only show when there's actually no history
         st.info("No history yet. Start a research query!")
     
+    # Older items evicted by the history limit are archived on disk; only read them on demand
+    if st.button("🗄️ Load older", width='stretch', key="load_older_history_btn"):
+        st.session_state.show_archived_history = not st.session_state.get('show_archived_history', False)
+    
+    if st.session_state.get('show_archived_history', False):
+        archived_history = load_archived_history()
+        if archived_history:
+            for idx, item in enumerate(archived_history):
+                query_display = item['query'][:40] + "..." if len(item['query']) > 40 else item['query']
+                button_label = f"🗄️ {query_display}\n🕒 {item['timestamp'][:16]}"
+                if st.button(button_label, key=f"archived_{item['timestamp']}_{idx}", width='stretch'):
+                    if restore_history_item(item):
+                        st.rerun()
+        else:
+            st.info("No older history archived")
+    
     # ========================================================================
     # CLEAR HISTORY BUTTON - FIXED VERSION (ONLY ONE!)
     # ========================================================================
@@ -287,6 +373,7 @@ with st.sidebar:
                 history_file = Path("data/history/research_history.json")
                 if history_file.exists():
                     history_file.write_text("[]", encoding='utf-8')
+                clear_persisted_results()
             except Exception as e:
                 console_log(f"Error clearing history file: {e}", "ERROR")
             
@@ -492,59 +579,20 @@ if st.button("🚀 Start Deep Research", width='stretch', type="primary", key="s
             )
             
             # Process results
-            all_findings = []
-            all_insights = []
-            all_sources = []
-            total_cost = 0.0
-            total_tokens = 0
-            total_execution_time = 0.0
-            agent_data = []
+            successes = [result for result in agent_results.values() if result.get('success')]
+            all_findings = list(chain.from_iterable(r.get('findings', []) for r in successes))
+            all_insights = list(chain.from_iterable(r.get('insights', []) for r in successes))
+            all_sources = list(chain.from_iterable(r.get('sources', []) for r in successes))
+            total_cost = sum(r.get('cost', 0.0) for r in successes)
+            total_tokens = sum(r.get('tokens', 0) for r in successes)
+            total_execution_time = sum(r.get('execution_time', 0.0) for r in successes)
+            agent_data = [build_agent_row(name, result) for name, result in agent_results.items()]
             
-            primary_summary = "Comprehensive research analysis completed."
-            
-            for agent_name, result in agent_results.items():
-                if result.get('success'):
-                    if 'summary' in result and result['summary']:
-                        primary_summary = result['summary']
-                    
-                    all_findings.extend(result.get('findings', []))
-                    all_insights.extend(result.get('insights', []))
-                    all_sources.extend(result.get('sources', []))
-                    total_cost += result.get('cost', 0.0)
-                    total_tokens += result.get('tokens', 0)
-                    total_execution_time += result.get('execution_time', 0.0)
-                    
-                    agent_data.append({
-                        "agent_name": agent_name,
-                        "source_count": result.get('source_count', 0),
-                        "sources_retrieved": result.get('sources_retrieved', 0),
-                        "findings_count": len(result.get('findings', [])),
-                        "insights_count": len(result.get('insights', [])),
-                        "cost": result.get('cost', 0.0),
-                        "tokens": result.get('tokens', 0),
-                        "prompt_tokens": result.get('prompt_tokens', 0),
-                        "completion_tokens": result.get('completion_tokens', 0),
-                        "execution_time": result.get('execution_time', 0.0),
-                        "status": result.get('status', 'Unknown'),
-                        "model_used": result.get('model_used', 'N/A'),
-                        "model_type": result.get('model_type', 'N/A'),
-                        "medium": result.get('medium', 'N/A'),
-                        "data_type": result.get('data_type', 'N/A')
-                    })
-                else:
-                    agent_data.append({
-                        "agent_name": agent_name,
-                        "source_count": 0,
-                        "sources_retrieved": 0,
-                        "findings_count": 0,
-                        "insights_count": 0,
-                        "cost": 0.0,
-                        "tokens": 0,
-                        "execution_time": result.get('execution_time', 0.0),
-                        "status": result.get('status', "❌ Failed"),
-                        "error": result.get('error', 'Unknown error'),
-                        "medium": result.get('medium', 'N/A')
-                    })
+            # The last agent with a non-empty summary provides the headline summary
+            primary_summary = next(
+                (r['summary'] for r in reversed(successes) if r.get('summary')),
+                "Comprehensive research analysis completed."
+            )
             
             # Calculate confidence score
             confidence_score = calculate_confidence_score(agent_results, len(all_sources))
@@ -553,6 +601,7 @@ if st.button("🚀 Start Deep Research", width='stretch', type="primary", key="s
             results = {
                 "query": query,
                 "domain": domain,
+                "run_id": uuid.uuid4().hex,
                 "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 "agents_used": [k for k, v in st.session_state.current_agents.items() if v],
                 "model_type": st.session_state.market_model_type,
@@ -587,16 +636,19 @@ if st.button("🚀 Start Deep Research", width='stretch', type="primary", key="s
                     "market_sources": st.session_state.market_sources,
                     "sentiment_sources": st.session_state.sentiment_sources,
                     "data_sources": st.session_state.data_sources,
-                    "results": results
+                    "result_id": persist_result(results)
                 }
                 
                 st.session_state.research_history.append(history_item)
                 
-                # FIXED: Implement history limit - remove oldest items if exceeded
+                # FIXED: Implement history limit - archive oldest items if exceeded
                 if len(st.session_state.research_history) > st.session_state.max_history_items:
-                    # Keep only the most recent items
-                    st.session_state.research_history = st.session_state.research_history[-st.session_state.max_history_items:]
-                    console_log(f"History limited to {st.session_state.max_history_items} items (oldest removed)")
+                    # Keep only the most recent items; evicted ones spill to disk
+                    st.session_state.research_history = trim_history(
+                        st.session_state.research_history,
+                        st.session_state.max_history_items
+                    )
+                    console_log(f"History limited to {st.session_state.max_history_items} items (oldest archived)")
                 
                 save_history_to_json()
             
@@ -614,7 +666,6 @@ if st.button("🚀 Start Deep Research", width='stretch', type="primary", key="s
 # ============================================================================
 
 if st.session_state.current_results:
-    from results_display import display_results
     display_results(st.session_state.current_results)
 
 st.markdown("---")
@@ -4,10 +4,12 @@ Handles all results visualization with proper source structure handling
 """
 
 import streamlit as st
-import json
+import html
+import re
 from datetime import datetime
 import pandas as pd
 import os
+import uuid
 
 try:
     import matplotlib.pyplot as plt
@@ -15,7 +17,17 @@ try:
 except ImportError:
     MATPLOTLIB_AVAILABLE = False
 
-from utils import generate_comprehensive_pdf, PDF_AVAILABLE
+from utils import generate_comprehensive_pdf, json_codec, PDF_AVAILABLE
+
+_LINE_BREAKS_RE = re.compile(r'\s*\n\s*')
+
+def card_text(value):
+    """
+    Escape text for a card in a joined HTML block
+    A stray tag or blank line would otherwise break every card after it
+    """
+    text = value if isinstance(value, str) else str(value)
+    return _LINE_BREAKS_RE.sub('<br>', html.escape(text.strip()))
 
 def flatten_sources(sources):
     """
@@ -56,60 +68,46 @@ def display_results(results):
     st.markdown("---")
     st.markdown("## 📊 Research Results")
     
-    # Top metrics
-    col1, col2, col3, col4, col5 = st.columns(5)
-    
-    with col1:
-        st.markdown(f"""
-        <div class="metric-card">
-            <div class="metric-label">Cost</div>
-            <div class="metric-value">${results.get('total_cost', 0):.4f}</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown(f"""
-        <div class="metric-card">
-            <div class="metric-label">Tokens</div>
-            <div class="metric-value">{results.get('total_tokens', 0):,}</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown(f"""
-        <div class="metric-card">
-            <div class="metric-label">Time</div>
-            <div class="metric-value">{results.get('execution_time', 0):.1f}s</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col4:
-        # FIXED: Flatten sources before counting
-        all_sources = flatten_sources(results.get('sources', []))
-        st.markdown(f"""
-        <div class="metric-card">
-            <div class="metric-label">Sources</div>
-            <div class="metric-value">{len(all_sources)}</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col5:
-        confidence = results.get('confidence_score', 0)
-        color = "#10b981" if confidence >= 75 else "#f59e0b" if confidence >= 50 else "#ef4444"
-        st.markdown(f"""
-        <div class="metric-card">
-            <div class="metric-label">Confidence</div>
-            <div class="metric-value" style="background: linear-gradient(135deg, {color} 0%, {color} 100%); -webkit-background-clip: text; -webkit-text-fill-color: transparent;">{confidence}/100</div>
-        </div>
-        """, unsafe_allow_html=True)
+    # Top metrics - one flex row in a single markdown element
+    # FIXED: Flatten sources before counting
+    all_sources = flatten_sources(results.get('sources', []))
+    confidence = results.get('confidence_score', 0)
+    color = "#10b981" if confidence >= 75 else "#f59e0b" if confidence >= 50 else "#ef4444"
+    metrics = [
+        ("Cost", f"${results.get('total_cost', 0):.4f}", ""),
+        ("Tokens", f"{results.get('total_tokens', 0):,}", ""),
+        ("Time", f"{results.get('execution_time', 0):.1f}s", ""),
+        ("Sources", len(all_sources), ""),
+        ("Confidence", f"{confidence}/100",
+         f' style="background: linear-gradient(135deg, {color} 0%, {color} 100%); -webkit-background-clip: text; -webkit-text-fill-color: transparent;"'),
+    ]
+    card_htmls = [
+        f'<div class="metric-card" style="flex: 1;">'
+        f'<div class="metric-label">{label}</div>'
+        f'<div class="metric-value"{value_style}>{value}</div>'
+        f'</div>'
+        for label, value, value_style in metrics
+    ]
+    st.markdown(
+        '<div style="display: flex; gap: 1rem;">' + "".join(card_htmls) + '</div>',
+        unsafe_allow_html=True
+    )
     
     # Export buttons
     st.markdown("---")
     col1, col2 = st.columns(2)
     
+    # Export payloads depend only on the results, so build them once per result set
+    # st.cache_data is shared across sessions, so key on the run's unique id;
+    # results saved before run_id existed get one for the rest of this session
+    results_key = results.setdefault('run_id', uuid.uuid4().hex)
+    # Filenames follow the run's own timestamp so repeated downloads match
+    timestamp = results.get('timestamp') or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    export_ts = timestamp.replace('-', '').replace(':', '').replace(' ', '_')
+    
     with col1:
-        results_json = json.dumps(results, indent=2, ensure_ascii=False)
-        json_filename = f"luminar_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        results_json = build_results_json(results_key, results)
+        json_filename = f"luminar_results_{export_ts}.json"
         st.download_button(
             "📥 Download Results JSON",
             results_json,
@@ -120,10 +118,10 @@ def display_results(results):
         )
     
     with col2:
-        pdf_filename = f"luminar_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        pdf_filename = f"luminar_report_{export_ts}.pdf"
         if PDF_AVAILABLE:
             try:
-                pdf_buffer = generate_comprehensive_pdf(results)
+                pdf_buffer = build_results_pdf(results_key, results)
                 if pdf_buffer:
                     st.download_button(
                         "📄 Download PDF Report",
@@ -140,33 +138,45 @@ def display_results(results):
         else:
             st.button("📄 PDF Unavailable", disabled=True, width='stretch')
     
-    # TABS
-    tabs = st.tabs([
-        "📊 Overview", 
-        "📋 Summary", 
-        "🔍 Findings", 
-        "💡 Insights", 
-        "🔗 Sources",
-        "📈 Statistics"
+    # TABS - st.tabs runs every tab body on each rerun, so a radio selects
+    # the single view to build
+    active_tab = st.radio(
+        "View",
+        list(RESULT_TABS),
+        horizontal=True,
+        label_visibility="collapsed",
+        key="active_results_tab"
+    )
+    RESULT_TABS[active_tab](results)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def build_results_json(results_key, _results):
+    """Serialize results for download; cached on results_key rather than hashing the whole tree"""
+    return json_codec.dumps(_results, indent=True)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def build_results_pdf(results_key, _results):
+    """Render the PDF report bytes; cached on results_key like build_results_json"""
+    pdf_buffer = generate_comprehensive_pdf(_results)
+    return pdf_buffer.getvalue() if pdf_buffer else None
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def build_agent_table(agent_data):
+    """Build the formatted agent performance table once per set of results"""
+    return pd.DataFrame([
+        {
+            "Agent": agent.get('agent_name', 'Unknown'),
+            "Status": agent.get('status', 'Unknown'),
+            "Sources": agent.get('source_count', 0),
+            "Findings": agent.get('findings_count', 0),
+            "Insights": agent.get('insights_count', 0),
+            "Tokens": agent.get('tokens', 0),
+            "Cost": f"${agent.get('cost', 0):.4f}",
+            "Time": f"{agent.get('execution_time', 0):.2f}s",
+            "Medium": agent.get('medium', 'N/A')
+        }
+        for agent in agent_data
     ])
-    
-    with tabs[0]:
-        display_overview_tab(results)
-    
-    with tabs[1]:
-        display_summary_tab(results)
-    
-    with tabs[2]:
-        display_findings_tab(results)
-    
-    with tabs[3]:
-        display_insights_tab(results)
-    
-    with tabs[4]:
-        display_sources_tab(results)
-    
-    with tabs[5]:
-        display_statistics_tab(results)
 
 def display_overview_tab(results):
     """Display analysis overview"""
@@ -174,25 +184,7 @@ def display_overview_tab(results):
     
     agent_data = results.get('agent_data', [])
     if agent_data:
-        df_data = []
-        for agent in agent_data:
-            df_data.append({
-                "Agent": agent.get('agent_name', 'Unknown'),
-                "Status": agent.get('status', 'Unknown'),
-                "Sources": agent.get('source_count', 0),
-                "Findings": agent.get('findings_count', 0),
-                "Insights": agent.get('insights_count', 0),
-                "Tokens": agent.get('tokens', 0),
-                "Cost": agent.get('cost', 0),
-                "Time": f"{agent.get('execution_time', 0):.2f}s",
-                "Medium": agent.get('medium', 'N/A')
-            })
-        
-        # Create DataFrame
-        df = pd.DataFrame(df_data)
-        
-        # Format cost column
-        df['Cost'] = df['Cost'].apply(lambda x: f"${x:.4f}")
+        df = build_agent_table(agent_data)
         
         # Display table
         st.dataframe(
@@ -238,15 +230,18 @@ def display_findings_tab(results):
     findings = results.get('key_findings', [])
     
     if findings:
+        # One markdown element for all cards instead of one per finding
+        html_parts = []
         for idx, finding in enumerate(findings, 1):
             clean = finding.strip() if isinstance(finding, str) else str(finding)
             if clean:
-                st.markdown(f"""
-                <div class="finding-card">
-                    <span style="color: #f97316; font-weight: 700; margin-right: 0.75rem; font-size: 1.1rem;">{idx}.</span>
-                    <span style="color: #334155; line-height: 1.7;">{clean}</span>
-                </div>
-                """, unsafe_allow_html=True)
+                html_parts.append(
+                    f'<div class="finding-card">'
+                    f'<span style="color: #f97316; font-weight: 700; margin-right: 0.75rem; font-size: 1.1rem;">{idx}.</span>'
+                    f'<span style="color: #334155; line-height: 1.7;">{card_text(clean)}</span>'
+                    f'</div>'
+                )
+        st.markdown("\n".join(html_parts), unsafe_allow_html=True)
     else:
         st.info("No key findings available")
 
@@ -256,14 +251,16 @@ def display_insights_tab(results):
     insights = results.get('insights', [])
     
     if insights:
+        html_parts = []
         for insight in insights:
             clean = insight.strip() if isinstance(insight, str) else str(insight)
             if clean:
-                st.markdown(f"""
-                <div style="display: inline-block; background: linear-gradient(135deg, #0ea5e9 0%, #0284c7 100%); color: white; padding: 0.75rem 1.25rem; border-radius: 24px; margin: 0.5rem 0.5rem 0.5rem 0; font-size: 0.95rem; font-weight: 500; box-shadow: 0 2px 8px rgba(14, 165, 233, 0.2);">
-                    ✓ {clean}
-                </div>
-                """, unsafe_allow_html=True)
+                html_parts.append(
+                    f'<div style="display: inline-block; background: linear-gradient(135deg, #0ea5e9 0%, #0284c7 100%); color: white; padding: 0.75rem 1.25rem; border-radius: 24px; margin: 0.5rem 0.5rem 0.5rem 0; font-size: 0.95rem; font-weight: 500; box-shadow: 0 2px 8px rgba(14, 165, 233, 0.2);">'
+                    f'✓ {card_text(clean)}'
+                    f'</div>'
+                )
+        st.markdown("\n".join(html_parts), unsafe_allow_html=True)
     else:
         st.info("No strategic insights available")
 
@@ -288,31 +285,36 @@ def display_sources_tab(results):
         for agent_name, sources in sources_by_agent.items():
             st.markdown(f"#### {agent_name} ({len(sources)} sources)")
             
+            # One markdown element per agent instead of one per source
+            html_parts = []
             for idx, source in enumerate(sources, 1):
-                title = source.get('title', 'Unknown')
-                source_type = source.get('source_type', 'Unknown')
-                medium = source.get('medium', 'N/A')
+                title = card_text(source.get('title', 'Unknown'))
+                source_type = card_text(source.get('source_type', 'Unknown'))
+                medium = card_text(source.get('medium', 'N/A'))
                 url = source.get('url', '#')
-                summary = source.get('summary', 'No description')
+                summary = card_text(source.get('summary', 'No description'))
                 
                 # Clean up N/A values
                 if not url or url == '#' or url == 'N/A':
                     url = '#'
                     url_display = 'URL not available'
                 else:
+                    url = html.escape(url.strip())
                     url_display = url
                 
-                st.markdown(f"""
-                <div style="background: white; border-radius: 8px; padding: 1.25rem; margin-bottom: 1rem; border: 1px solid #e2e8f0; box-shadow: 0 1px 2px rgba(0,0,0,0.05);">
-                    <div style="display: flex; justify-content: space-between; align-items: start; margin-bottom: 0.5rem;">
-                        <div style="font-weight: 600; color: #0ea5e9; flex: 1;">{idx}. {title}</div>
-                        <span style="background: #e0f2fe; color: #0284c7; padding: 0.25rem 0.75rem; border-radius: 12px; font-size: 0.75rem; white-space: nowrap; margin-left: 1rem;">{source_type}</span>
-                    </div>
-                    <div style="color: #64748b; font-size: 0.85rem; margin-bottom: 0.5rem;">📡 Medium: {medium}</div>
-                    <a href="{url}" target="_blank" style="color: #64748b; font-size: 0.85rem; word-break: break-all;">🔗 {url_display}</a>
-                    <div style="color: #475569; margin-top: 0.5rem; font-size: 0.9rem;">{summary}</div>
-                </div>
-                """, unsafe_allow_html=True)
+                html_parts.append(
+                    f'<div style="background: white; border-radius: 8px; padding: 1.25rem; margin-bottom: 1rem; border: 1px solid #e2e8f0; box-shadow: 0 1px 2px rgba(0,0,0,0.05);">'
+                    f'<div style="display: flex; justify-content: space-between; align-items: start; margin-bottom: 0.5rem;">'
+                    f'<div style="font-weight: 600; color: #0ea5e9; flex: 1;">{idx}. {title}</div>'
+                    f'<span style="background: #e0f2fe; color: #0284c7; padding: 0.25rem 0.75rem; border-radius: 12px; font-size: 0.75rem; white-space: nowrap; margin-left: 1rem;">{source_type}</span>'
+                    f'</div>'
+                    f'<div style="color: #64748b; font-size: 0.85rem; margin-bottom: 0.5rem;">📡 Medium: {medium}</div>'
+                    f'<a href="{url}" target="_blank" style="color: #64748b; font-size: 0.85rem; word-break: break-all;">🔗 {url_display}</a>'
+                    f'<div style="color: #475569; margin-top: 0.5rem; font-size: 0.9rem;">{summary}</div>'
+                    f'</div>'
+                )
+            
+            st.markdown("\n".join(html_parts), unsafe_allow_html=True)
     else:
         st.info("No sources available")
 
@@ -379,4 +381,13 @@ def display_statistics_tab(results):
         st.write(f"**Success Rate:** {success_rate:.1f}% ({success_count}/{total_agents} agents)")
         
     else:
-        st.info("No statistics available")
\ No newline at end of file
+        st.info("No statistics available")
+
+RESULT_TABS = {
+    "📊 Overview": display_overview_tab,
+    "📋 Summary": display_summary_tab,
+    "🔍 Findings": display_findings_tab,
+    "💡 Insights": display_insights_tab,
+    "🔗 Sources": display_sources_tab,
+    "📈 Statistics": display_statistics_tab
+}
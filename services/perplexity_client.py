@@ -15,6 +15,7 @@ _DEFAULT_BASE_URL = "https://api.perplexity.ai"
 _DEFAULT_MODEL = "sonar-pro"
 _DEFAULT_TIMEOUT = 120  # Original working timeout
 _BULLET_MARKERS = ("-", "*", "\u2022", "\u2023", "\u00b7")
+_BULLET_START = frozenset(_BULLET_MARKERS)  # every marker is one character
 
 
 def _safe_text(response: requests.Response) -> str:
@@ -233,7 +234,7 @@ class PerplexityClient:
             # Extract bullet points as findings
             for line in lines:
                 stripped = line.strip()
-                if any(stripped.startswith(marker) for marker in _BULLET_MARKERS):
+                if stripped[:1] in _BULLET_START:
                     finding = _strip_bullet_prefix(stripped)
                     if len(finding) > 20:  # Only substantial findings
                         sections["findings"].append(finding)
@@ -0,0 +1,58 @@
+"""Tests for source de-duplication helpers in agents.api_agent."""
+
+from agents.api_agent import _canonical_url, _dedup_sources, _title_key
+
+
+def test_canonical_url_drops_query_fragment_and_trailing_slash():
+    assert _canonical_url("https://Example.COM/path/?utm=1#top") == "https://example.com/path"
+
+
+def test_canonical_url_of_empty_url_is_empty():
+    assert _canonical_url("") == ""
+
+
+def test_title_key_normalises_case_and_whitespace():
+    assert _title_key("  Deep   Learning\tReview ") == "deep learning review"
+
+
+def test_title_key_keeps_dash_suffix_by_default():
+    assert _title_key("Foo - Part I") != _title_key("Foo - Part II")
+
+
+def test_title_key_strips_site_suffix_for_news():
+    assert _title_key("Markets rally - Reuters", strip_site=True) == "markets rally"
+
+
+def test_dedup_drops_repeated_canonical_url():
+    sources = [
+        {"title": "A", "url": "https://example.com/a/", "source_type": "news"},
+        {"title": "B", "url": "https://EXAMPLE.com/a?ref=x", "source_type": "news"},
+    ]
+    assert _dedup_sources(sources) == sources[:1]
+
+
+def test_dedup_drops_news_syndicated_under_another_site():
+    sources = [
+        {"title": "Markets rally - Reuters", "url": "https://a.com/1", "source_type": "news"},
+        {"title": "Markets rally - Yahoo", "url": "https://b.com/2", "source_type": "news"},
+    ]
+    assert _dedup_sources(sources) == sources[:1]
+
+
+def test_dedup_keeps_papers_differing_after_dash():
+    sources = [
+        {"title": "Foo - Part I", "url": "http://arxiv.org/abs/1", "source_type": "academic"},
+        {"title": "Foo - Part II", "url": "http://arxiv.org/abs/2", "source_type": "academic"},
+        {"title": "X - A Survey", "url": "http://arxiv.org/abs/3", "source_type": "academic"},
+        {"title": "X - A Benchmark", "url": "http://arxiv.org/abs/4", "source_type": "academic"},
+    ]
+    assert _dedup_sources(sources) == sources
+
+
+def test_dedup_keeps_sources_without_url():
+    sources = [
+        {"title": "First", "url": "", "source_type": "news"},
+        {"title": "Second", "source_type": "news"},
+        {"title": "Third", "url": None, "source_type": "news"},
+    ]
+    assert _dedup_sources(sources) == sources
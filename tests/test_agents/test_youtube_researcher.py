@@ -0,0 +1,91 @@
+"""Tests for batched YouTube summaries and their per-video caching."""
+
+from dataclasses import replace
+from types import SimpleNamespace
+
+import pytest
+
+from agents import youtube_researcher as yt
+from utils import prompt_cache
+
+
+def _video(video_id):
+    return yt._PreparedVideo(
+        video_id=video_id,
+        title=f"Video {video_id}",
+        channel="Channel",
+        metadata={},
+        duration="10:00",
+        views="100",
+        tags=["ai"],
+        full_description="A long description of the video. " * 20,
+        url=f"https://www.youtube.com/watch?v={video_id}",
+    )
+
+
+def _prompt(info):
+    return yt._video_prompt(
+        info.title, info.channel, info.full_description, info.url,
+        info.tags, info.views, info.duration,
+    )
+
+
+@pytest.fixture
+def llm_calls(tmp_path, monkeypatch):
+    """Isolate the prompt cache and record every LLM prompt sent."""
+    monkeypatch.setattr(yt, "_PROMPT_CACHE_PATH", tmp_path / "prompts.sqlite")
+    monkeypatch.setattr(prompt_cache, "_caches", {})
+    monkeypatch.setattr(yt, "get_semantic_cache", lambda path: None)
+
+    calls = []
+
+    def fake_invoke(name, prompt):
+        calls.append(prompt)
+        count = prompt.count("### Task ")
+        reply = yt.json_codec.dumps([f"summary {n}" for n in range(1, count + 1)]).decode()
+        metrics = replace(yt.zero_metrics("youtube_summarizer"), total_tokens=7, cost=0.1)
+        return SimpleNamespace(content=reply), metrics
+
+    monkeypatch.setattr(yt, "invoke_llm", fake_invoke)
+    return calls
+
+
+def test_batch_entries_use_the_summary_prompt_template(llm_calls):
+    infos = [_video("a"), _video("b")]
+    yt._summarize_videos_batch(infos)
+
+    assert len(llm_calls) == 1
+    for info in infos:
+        assert _prompt(info) in llm_calls[0]
+
+
+def test_batch_stores_each_summary_under_its_video_prompt(llm_calls):
+    infos = [_video("a"), _video("b")]
+    results = yt._summarize_videos_batch(infos)
+
+    assert [summary for summary, _ in results] == ["summary 1", "summary 2"]
+    assert [metrics["total_tokens"] for _, metrics in results] == [7, 0]
+    cache = prompt_cache.get_prompt_cache(yt._PROMPT_CACHE_PATH)
+    assert cache.get(_prompt(infos[1]))[0] == "summary 2"
+
+
+def test_batch_sends_only_cache_misses(llm_calls):
+    yt._summarize_videos_batch([_video("a"), _video("b")])
+    llm_calls.clear()
+
+    results = yt._summarize_videos_batch([_video("a"), _video("c"), _video("d")])
+
+    assert len(llm_calls) == 1
+    assert _prompt(_video("a")) not in llm_calls[0]
+    assert results[0] == ("summary 1", yt._zero_metrics_dict())
+    assert [summary for summary, _ in results[1:]] == ["summary 1", "summary 2"]
+
+
+def test_single_miss_is_left_to_the_per_video_path(llm_calls):
+    yt._summarize_videos_batch([_video("a"), _video("b")])
+    llm_calls.clear()
+
+    results = yt._summarize_videos_batch([_video("a"), _video("c")])
+
+    assert llm_calls == []
+    assert results[0] is not None and results[1] is None
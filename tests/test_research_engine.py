@@ -0,0 +1,128 @@
+"""Tests for result reuse and in-flight coalescing in research_engine."""
+
+import threading
+
+import pytest
+
+import research_engine
+
+
+AGENTS = {"Market Intelligence": True, "Sentiment Analytics": False}
+
+
+def _execute(query="Solar storage", agents=AGENTS):
+    return research_engine.execute_research(query, "technology", agents, "Quick Search", 2, 2, 2)
+
+
+@pytest.fixture
+def runs(monkeypatch):
+    """Replace the agent fan-out with a counter and start from an empty cache."""
+    research_engine._RESULTS_CACHE.clear()
+    calls = []
+
+    def fake_run_agents(query, *args):
+        calls.append(query)
+        return {"Market Intelligence": {"success": True, "findings": ["a"]}}
+
+    monkeypatch.setattr(research_engine, "_run_agents", fake_run_agents)
+    yield calls
+    research_engine._RESULTS_CACHE.clear()
+
+
+def test_cache_key_ignores_query_case_whitespace_and_agent_order(runs):
+    _execute("Solar storage")
+    _execute("  solar STORAGE ")
+    _execute("solar storage", dict(reversed(list(AGENTS.items()))))
+
+    assert len(runs) == 1
+
+
+def test_different_settings_are_not_shared(runs):
+    _execute()
+    _execute(agents={"Market Intelligence": True, "Sentiment Analytics": True})
+
+    assert len(runs) == 2
+
+
+def test_cache_hit_returns_an_independent_copy(runs):
+    first = _execute()
+    first["Market Intelligence"]["findings"].append("mutated")
+
+    second = _execute()
+
+    assert second["Market Intelligence"]["findings"] == ["a"]
+    second["Market Intelligence"]["findings"].clear()
+    assert _execute()["Market Intelligence"]["findings"] == ["a"]
+
+
+def test_failed_runs_are_not_cached(runs, monkeypatch):
+    def failing_run_agents(query, *args):
+        runs.append(query)
+        return {
+            "Market Intelligence": {"success": True},
+            "Sentiment Analytics": {"success": False, "error": "boom"},
+        }
+
+    monkeypatch.setattr(research_engine, "_run_agents", failing_run_agents)
+    _execute()
+    _execute()
+
+    assert len(runs) == 2
+
+
+def test_identical_concurrent_requests_share_one_run(runs, monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_run_agents(query, *args):
+        runs.append(query)
+        started.set()
+        release.wait(5)
+        return {"Market Intelligence": {"success": True, "findings": ["a"]}}
+
+    monkeypatch.setattr(research_engine, "_run_agents", slow_run_agents)
+    results = {}
+
+    def run(name):
+        results[name] = _execute()
+
+    owner = threading.Thread(target=run, args=("owner",))
+    owner.start()
+    assert started.wait(5)
+    waiter = threading.Thread(target=run, args=("waiter",))
+    waiter.start()
+    waiter.join(0.2)
+    assert waiter.is_alive()
+
+    release.set()
+    owner.join(5)
+    waiter.join(5)
+
+    assert len(runs) == 1
+    assert results["owner"] == results["waiter"]
+    results["waiter"]["Market Intelligence"]["findings"].append("mutated")
+    assert results["owner"]["Market Intelligence"]["findings"] == ["a"]
+    assert research_engine._INFLIGHT_RUNS == {}
+
+
+def test_unrelated_request_is_not_blocked_by_a_running_one(runs, monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+
+    def run_agents(query, *args):
+        runs.append(query)
+        if query == "slow":
+            started.set()
+            release.wait(5)
+        return {"Market Intelligence": {"success": True}}
+
+    monkeypatch.setattr(research_engine, "_run_agents", run_agents)
+    slow = threading.Thread(target=_execute, args=("slow",))
+    slow.start()
+    assert started.wait(5)
+
+    _execute("fast")
+
+    assert runs == ["slow", "fast"]
+    release.set()
+    slow.join(5)
@@ -0,0 +1,70 @@
+"""Tests for on-disk history results and archival in utils."""
+
+import pytest
+
+import utils
+
+
+@pytest.fixture
+def history_dirs(tmp_path, monkeypatch):
+    """Point the results and archive directories at a temporary location."""
+    monkeypatch.setattr(utils, "RESULTS_DIR", tmp_path / "results")
+    monkeypatch.setattr(utils, "HISTORY_ARCHIVE_DIR", tmp_path / "archive")
+    return tmp_path
+
+
+def _item(day, result_id=None, **extra):
+    item = {"query": f"query {day}", "timestamp": f"2025-01-{day:02d} 10:00:00", **extra}
+    if result_id is not None:
+        item["result_id"] = result_id
+    return item
+
+
+def test_result_id_round_trip(history_dirs):
+    results = {"query": "q", "sources": [{"title": "é"}]}
+
+    result_id = utils.persist_result(results)
+
+    assert utils.load_result(result_id) == results
+    assert utils.resolve_history_item(_item(1, result_id))["results"] == results
+
+
+def test_legacy_item_with_embedded_results_is_returned_unchanged(history_dirs):
+    legacy = _item(1, results={"query": "old"})
+
+    assert utils.resolve_history_item(legacy) is legacy
+
+
+def test_missing_result_file_resolves_to_none(history_dirs):
+    assert utils.load_result("does-not-exist") is None
+    assert utils.resolve_history_item(_item(1, "does-not-exist"))["results"] is None
+
+
+def test_trim_history_moves_results_into_the_archive(history_dirs):
+    history = [_item(day, utils.persist_result({"day": day})) for day in (1, 2, 3)]
+
+    kept = utils.trim_history(history, 1)
+
+    assert kept == history[-1:]
+    assert [path.stem for path in (history_dirs / "results").iterdir()] == [history[-1]["result_id"]]
+    archived = utils.load_archived_history()
+    assert [item["results"] for item in archived] == [{"day": 2}, {"day": 1}]
+    assert all("result_id" not in item for item in archived)
+
+
+def test_archive_is_pruned_to_the_limit(history_dirs, monkeypatch):
+    monkeypatch.setattr(utils, "HISTORY_ARCHIVE_LIMIT", 3)
+
+    utils.archive_history_items([_item(day, results={"day": day}) for day in range(1, 6)])
+
+    assert len(list((history_dirs / "archive").glob("*.json"))) == 3
+    assert [item["results"]["day"] for item in utils.load_archived_history()] == [5, 4, 3]
+
+
+def test_clear_persisted_results_removes_every_file(history_dirs):
+    for day in (1, 2):
+        utils.persist_result({"day": day})
+
+    utils.clear_persisted_results()
+
+    assert list((history_dirs / "results").iterdir()) == []
@@ -0,0 +1,66 @@
+"""Tests for the SQLite-backed prompt cache and its in-memory hot tier."""
+
+import time
+
+from utils import prompt_cache
+from utils.prompt_cache import PromptCache, prompt_key
+
+
+def test_get_returns_what_set_stored(tmp_path):
+    cache = PromptCache(tmp_path / "cache.sqlite")
+
+    cache.set("prompt", "answer", {"total_tokens": 3})
+
+    assert cache.get("prompt") == ("answer", {"total_tokens": 3})
+    assert cache.get("other prompt") is None
+
+
+def test_entries_survive_a_new_instance(tmp_path):
+    PromptCache(tmp_path / "cache.sqlite").set("prompt", "answer", {})
+
+    assert PromptCache(tmp_path / "cache.sqlite").get("prompt") == ("answer", {})
+
+
+def test_entries_expire_from_both_tiers(tmp_path):
+    cache = PromptCache(tmp_path / "cache.sqlite", ttl=0.05)
+    cache.set("prompt", "answer", {})
+    assert cache._hot.get(prompt_key("prompt")) is not None
+
+    time.sleep(0.1)
+
+    assert cache._hot.get(prompt_key("prompt")) is None
+    assert cache.get("prompt") is None
+
+
+def test_sqlite_hit_is_promoted_for_its_remaining_ttl(tmp_path, monkeypatch):
+    path = tmp_path / "cache.sqlite"
+    PromptCache(path).set("prompt", "answer", {})
+    monkeypatch.setattr(prompt_cache.time, "time", lambda: time.time_ns() / 1e9 + 90)
+
+    cache = PromptCache(path, ttl=100)
+    assert cache.get("prompt") == ("answer", {})
+
+    expires_at, _ = cache._hot._data[prompt_key("prompt")]
+    assert expires_at - time.monotonic() <= 10
+
+
+def test_set_deletes_expired_rows(tmp_path):
+    cache = PromptCache(tmp_path / "cache.sqlite", ttl=60)
+    cache._conn.execute(
+        "INSERT INTO cache (k, v, ts) VALUES (?, ?, ?)", ("stale", b"{}", int(time.time()) - 120)
+    )
+    cache._conn.commit()
+
+    cache.set("prompt", "answer", {})
+
+    keys = [row[0] for row in cache._conn.execute("SELECT k FROM cache")]
+    assert keys == [prompt_key("prompt")]
+
+
+def test_get_prompt_cache_shares_one_instance_per_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(prompt_cache, "_caches", {})
+
+    first = prompt_cache.get_prompt_cache(tmp_path / "a.sqlite")
+
+    assert prompt_cache.get_prompt_cache(tmp_path / "a.sqlite") is first
+    assert prompt_cache.get_prompt_cache(tmp_path / "b.sqlite") is not first
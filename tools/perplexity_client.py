@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import re
 import time
+from functools import lru_cache
 from typing import Any, Dict, Iterable, List, Optional
 
 import requests
@@ -11,6 +12,8 @@ _DEFAULT_BASE_URL = "https://api.perplexity.ai"
 _DEFAULT_MODEL = "sonar-pro"
 _DEFAULT_TIMEOUT = 120
 _BULLET_MARKERS = ("-", "*", "\u2022", "\u2023", "\u00b7")
+_NUMBERED_ITEM_RE = re.compile(r"^[0-9]+[\).]")
+_SECTION_BOUNDARY_RE = re.compile(r"(?im)^\s*(?:\d+\.\s*)?(?:[#*]+\s*)?\**[A-Z][^\n]{0,80}\**\s*:?.*$")
 
 
 def _safe_text(response: requests.Response) -> str:
@@ -20,6 +23,11 @@ def _safe_text(response: requests.Response) -> str:
         return ""
 
 
+@lru_cache(maxsize=None)
+def _section_heading_re(header: str) -> "re.Pattern[str]":
+    return re.compile(rf"(?im)^\s*(?:\d+\.\s*)?(?:[#*]+\s*)?\**{re.escape(header)}\**\s*:?.*$")
+
+
 def _strip_bullet_prefix(value: str) -> str:
     stripped = value.lstrip("-*\t \u2022\u2023\u00b7")
     return stripped.lstrip("0123456789. )-\u2022\u2023\u00b7")
@@ -201,16 +209,12 @@ class PerplexityClient:
 
     def _locate_section(self, text: str, headers: Iterable[str]) -> Optional[str]:
         for header in headers:
-            heading = re.compile(
-                rf"(?im)^\s*(?:\d+\.\s*)?(?:[#*]+\s*)?\**{re.escape(header)}\**\s*:?.*$"
-            )
-            match = heading.search(text)
+            match = _section_heading_re(header).search(text)
             if not match:
                 continue
             start = match.end()
             remainder = text[start:]
-            boundary = re.compile(r"(?im)^\s*(?:\d+\.\s*)?(?:[#*]+\s*)?\**[A-Z][^\n]{0,80}\**\s*:?.*$")
-            next_match = boundary.search(remainder)
+            next_match = _SECTION_BOUNDARY_RE.search(remainder)
             end = next_match.start() if next_match else len(remainder)
             section_text = remainder[:end].strip()
             if section_text:
@@ -223,7 +227,7 @@ class PerplexityClient:
             stripped = line.strip()
             if not stripped:
                 continue
-            if stripped.startswith(_BULLET_MARKERS) or re.match(r"^[0-9]+[\).]", stripped):
+            if stripped.startswith(_BULLET_MARKERS) or _NUMBERED_ITEM_RE.match(stripped):
                 cleaned = _strip_bullet_prefix(stripped)
                 if cleaned:
                     bullets.append(cleaned)
@@ -236,7 +240,7 @@ class PerplexityClient:
             if len(lines) >= 6:
                 break
             stripped = line.strip()
-            if stripped.startswith(_BULLET_MARKERS) or re.match(r"^[0-9]+[\).]", stripped):
+            if stripped.startswith(_BULLET_MARKERS) or _NUMBERED_ITEM_RE.match(stripped):
                 lines.append(stripped)
         return "\n".join(lines)
 
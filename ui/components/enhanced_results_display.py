@@ -7,6 +7,7 @@ Enhanced results display component with intelligent synthesis across agents
 """
 
 import streamlit as st
+import pandas as pd
 import re
 from typing import Dict, List, Any
 from collections import Counter
@@ -466,7 +467,6 @@ def render_enhanced_results(results: Dict):
                 'Tokens': f"{agent_result.get('tokens', 0):,}"
             })
         
-        import pandas as pd
         df = pd.DataFrame(agent_data)
     st.dataframe(df, width='stretch', hide_index=True)
         
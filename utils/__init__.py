@@ -3,12 +3,16 @@ Utility Functions Module - FIXED VERSION
 PDF generation, history management with limits, helper functions
 """
 
-import json
 import sys
+import time
+import uuid
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from io import BytesIO
 
+from utils import json_codec
+
 # PDF generation imports
 try:
     from reportlab.lib.pagesizes import letter
@@ -55,6 +59,95 @@ def calculate_confidence_score(agent_results, total_sources):
 # HISTORY MANAGEMENT WITH LIMIT SUPPORT
 # ============================================================================
 
+HISTORY_FILE = Path("data/history/research_history.json")
+HISTORY_ARCHIVE_DIR = Path("data/history/archive")
+
+RESULTS_DIR = Path("data/history/results")
+
+def persist_result(results):
+    """Write a full results dict to disk and return the key used to load it back"""
+    result_id = uuid.uuid4().hex
+    try:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        (RESULTS_DIR / f"{result_id}.json").write_bytes(json_codec.dumps(results))
+    except Exception as e:
+        console_log(f"Error persisting results: {e}", "ERROR")
+    return result_id
+
+def load_result(result_id):
+    """Load a results dict previously stored by persist_result, or None if missing"""
+    try:
+        return json_codec.loads((RESULTS_DIR / f"{result_id}.json").read_bytes())
+    except Exception as e:
+        console_log(f"Error loading results {result_id}: {e}", "ERROR")
+        return None
+
+def delete_result(result_id):
+    """Remove the stored results file for *result_id*, if any"""
+    try:
+        (RESULTS_DIR / f"{result_id}.json").unlink(missing_ok=True)
+    except Exception as e:
+        console_log(f"Error deleting results {result_id}: {e}", "ERROR")
+
+def clear_persisted_results():
+    """Remove every stored results file; used when the history is cleared"""
+    if not RESULTS_DIR.exists():
+        return
+    for result_file in RESULTS_DIR.glob("*.json"):
+        try:
+            result_file.unlink()
+        except Exception as e:
+            console_log(f"Error deleting results {result_file}: {e}", "ERROR")
+
+def resolve_history_item(item):
+    """Return *item* with its full results attached (None if they cannot be loaded)"""
+    if 'results' in item or 'result_id' not in item:
+        return item
+    return {**item, 'results': load_result(item['result_id'])}
+
+HISTORY_ARCHIVE_LIMIT = 200  # archived items kept on disk; oldest are pruned
+
+def archive_history_items(items):
+    """Spill history items evicted by the limit to disk, one JSON file each"""
+    if not items:
+        return
+    try:
+        HISTORY_ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+        for item in items:
+            # Archive files are self-contained, so the results file moves into them
+            archived = resolve_history_item(item)
+            archived.pop('result_id', None)
+            stamp = ''.join(ch for ch in item.get('timestamp', '') if ch.isdigit())
+            archive_file = HISTORY_ARCHIVE_DIR / f"{stamp}_{time.time_ns()}.json"
+            archive_file.write_bytes(json_codec.dumps(archived))
+            if 'result_id' in item:
+                delete_result(item['result_id'])
+        
+        for stale_file in sorted(HISTORY_ARCHIVE_DIR.glob("*.json"), reverse=True)[HISTORY_ARCHIVE_LIMIT:]:
+            stale_file.unlink(missing_ok=True)
+        console_log(f"Archived {len(items)} old history items")
+    except Exception as e:
+        console_log(f"Error archiving history: {e}", "ERROR")
+
+def load_archived_history(limit=20):
+    """Return up to *limit* archived history items, newest first"""
+    if not HISTORY_ARCHIVE_DIR.exists():
+        return []
+    items = []
+    for archive_file in sorted(HISTORY_ARCHIVE_DIR.glob("*.json"), reverse=True)[:limit]:
+        try:
+            items.append(json_codec.loads(archive_file.read_bytes()))
+        except Exception as e:
+            console_log(f"Skipping unreadable history archive {archive_file}: {e}", "WARNING")
+    return items
+
+def trim_history(history, max_items):
+    """Keep the newest *max_items* entries, archiving the rest instead of dropping them"""
+    if len(history) <= max_items:
+        return history
+    archive_history_items(history[:-max_items])
+    return history[-max_items:]
+
 def save_history_to_json():
     """
     Save history to JSON file with limit enforcement
@@ -63,18 +156,17 @@ def save_history_to_json():
     try:
         import streamlit as st
         
-        history_file = Path("data/history/research_history.json")
+        history_file = HISTORY_FILE
         history_file.parent.mkdir(parents=True, exist_ok=True)
         
         # FIXED: Enforce history limit before saving
         max_items = st.session_state.get('max_history_items', 5)
         if len(st.session_state.research_history) > max_items:
-            # Keep only the most recent items
-            st.session_state.research_history = st.session_state.research_history[-max_items:]
+            # Keep only the most recent items; older ones move to the archive
+            st.session_state.research_history = trim_history(st.session_state.research_history, max_items)
             console_log(f"History trimmed to {max_items} items before saving")
         
-        with open(history_file, 'w', encoding='utf-8') as f:
-            json.dump(st.session_state.research_history, f, indent=2, ensure_ascii=False)
+        history_file.write_bytes(json_codec.dumps(st.session_state.research_history, indent=True))
         
         console_log(f"✅ History saved: {len(st.session_state.research_history)} items")
         return True
@@ -90,17 +182,16 @@ def load_history_from_json():
     try:
         import streamlit as st
         
-        history_file = Path("data/history/research_history.json")
+        history_file = HISTORY_FILE
         
         if history_file.exists():
-            with open(history_file, 'r', encoding='utf-8') as f:
-                loaded_history = json.load(f)
+            loaded_history = json_codec.loads(history_file.read_bytes())
             
             # FIXED: Respect max_history_items when loading
             max_items = st.session_state.get('max_history_items', 5)
             if len(loaded_history) > max_items:
-                # Keep only the most recent items
-                loaded_history = loaded_history[-max_items:]
+                # Keep only the most recent items; older ones move to the archive
+                loaded_history = trim_history(loaded_history, max_items)
                 console_log(f"History trimmed to {max_items} items on load")
             
             st.session_state.research_history = loaded_history
@@ -132,7 +223,7 @@ def clear_old_history():
         
         if current_count > max_items:
             removed_count = current_count - max_items
-            st.session_state.research_history = st.session_state.research_history[-max_items:]
+            st.session_state.research_history = trim_history(st.session_state.research_history, max_items)
             console_log(f"Removed {removed_count} old history items (limit: {max_items})")
             save_history_to_json()
             return True
@@ -201,6 +292,47 @@ def create_chart_image(chart_type='bar', title='', labels=None, values=None, col
 # PDF GENERATION
 # ============================================================================
 
+@lru_cache(maxsize=1)
+def _pdf_styles():
+    """Build the report paragraph and table styles once; reportlab only reads them"""
+    styles = getSampleStyleSheet()
+    
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#1e293b'),
+        spaceAfter=30,
+        alignment=TA_CENTER
+    )
+    
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor('#0ea5e9'),
+        spaceAfter=12,
+        spaceBefore=12
+    )
+    
+    body_style = ParagraphStyle(
+        'CustomBody',
+        parent=styles['BodyText'],
+        fontSize=11,
+        leading=14,
+        alignment=TA_JUSTIFY
+    )
+    
+    table_style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0ea5e9')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f9ff')])
+    ])
+    
+    return title_style, heading_style, body_style, table_style
+
 def generate_comprehensive_pdf(results):
     """Generate comprehensive PDF report from research results"""
     if not PDF_AVAILABLE:
@@ -212,34 +344,7 @@ def generate_comprehensive_pdf(results):
         doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
         
         story = []
-        styles = getSampleStyleSheet()
-        
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#1e293b'),
-            spaceAfter=30,
-            alignment=TA_CENTER
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=colors.HexColor('#0ea5e9'),
-            spaceAfter=12,
-            spaceBefore=12
-        )
-        
-        body_style = ParagraphStyle(
-            'CustomBody',
-            parent=styles['BodyText'],
-            fontSize=11,
-            leading=14,
-            alignment=TA_JUSTIFY
-        )
+        title_style, heading_style, body_style, table_style = _pdf_styles()
         
         # Title
         story.append(Paragraph("🔬 Luminar Deep Research Report", title_style))
@@ -262,13 +367,7 @@ def generate_comprehensive_pdf(results):
         ]
         
         metadata_table = Table(metadata, colWidths=[2*inch, 4*inch])
-        metadata_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0ea5e9')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f9ff')])
-        ]))
+        metadata_table.setStyle(table_style)
         
         story.append(metadata_table)
         story.append(Spacer(1, 0.2*inch))
@@ -290,13 +389,7 @@ def generate_comprehensive_pdf(results):
                 ])
             
             metrics_table = Table(metrics_data, colWidths=[1.5*inch, 0.7*inch, 0.7*inch, 0.8*inch, 0.7*inch, 1.2*inch])
-            metrics_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0ea5e9')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f9ff')])
-            ]))
+            metrics_table.setStyle(table_style)
             
             story.append(metrics_table)
             story.append(Spacer(1, 0.2*inch))
@@ -331,10 +424,14 @@ def generate_comprehensive_pdf(results):
             story.append(PageBreak())
             story.append(Paragraph("Research Sources", heading_style))
             
+            # One paragraph per source so the line breaker runs once per entry
             for idx, source in enumerate(sources[:20], 1):
-                story.append(Paragraph(f"<b>[{idx}] {source.get('title', 'Unknown')}</b>", body_style))
-                story.append(Paragraph(f"URL: {source.get('url', 'N/A')}", body_style))
-                story.append(Paragraph(f"Summary: {source.get('summary', 'No summary')[:200]}...", body_style))
+                story.append(Paragraph(
+                    f"<b>[{idx}] {source.get('title', 'Unknown')}</b><br/>"
+                    f"URL: {source.get('url', 'N/A')}<br/>"
+                    f"Summary: {source.get('summary', 'No summary')[:200]}...",
+                    body_style
+                ))
                 story.append(Spacer(1, 0.1*inch))
         
         # Build PDF
@@ -408,7 +505,7 @@ def export_to_markdown(results):
 def export_to_json(results):
     """Export results to JSON format"""
     try:
-        return json.dumps(results, indent=2, ensure_ascii=False)
+        return json_codec.dumps(results, indent=True).decode('utf-8')
     except Exception as e:
         console_log(f"Error exporting to JSON: {e}", "ERROR")
         return None
\ No newline at end of file
@@ -0,0 +1,37 @@
+"""JSON encode/decode helpers backed by orjson when it is installed."""
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def loads(data: Union[bytes, bytearray, str]) -> Any:
+    """Decode a JSON document from raw response bytes or text."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(
+    obj: Any,
+    *,
+    indent: bool = False,
+    default: Optional[Callable[[Any], Any]] = None,
+) -> bytes:
+    """Encode *obj* as UTF-8 JSON bytes, optionally indented by two spaces.
+
+    *default* converts objects the encoder does not support natively.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=default, option=option)
+    return json.dumps(
+        obj, indent=2 if indent else None, ensure_ascii=False, default=default
+    ).encode("utf-8")
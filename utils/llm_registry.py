@@ -34,7 +34,7 @@ class LLMConfig:
     default_kwargs: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMCallMetrics:
     """Metrics captured for each LLM invocation."""
 
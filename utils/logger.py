@@ -1 +1,35 @@
-import logging
\ No newline at end of file
+"""Process-wide logging setup that keeps handler I/O off request threads."""
+from __future__ import annotations
+
+import atexit
+import logging
+import logging.handlers
+import queue
+from typing import Optional
+
+_LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """Route root logging through a queue drained by a background listener.
+
+    Safe to call on every Streamlit rerun; only the first call installs handlers.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(_LOG_FORMAT))
+
+    root = logging.getLogger()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
@@ -0,0 +1,82 @@
+"""Exact-match LLM response cache keyed by the SHA-256 of the rendered prompt."""
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from utils import json_codec
+from utils.caching import TTLCache
+
+DEFAULT_TTL = 7 * 24 * 3600  # seconds
+HOT_SET_SIZE = 256
+
+
+def prompt_key(prompt: str) -> str:
+    """Return the cache key for a rendered prompt."""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+class PromptCache:
+    """SQLite-backed ``prompt -> (content, metrics)`` store with a per-entry TTL.
+
+    Recently used entries are also held in memory so repeat hits skip SQLite.
+    """
+
+    def __init__(self, path: Path, ttl: float = DEFAULT_TTL) -> None:
+        self.ttl = ttl
+        self._hot = TTLCache(maxsize=HOT_SET_SIZE, ttl=ttl)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (k TEXT PRIMARY KEY, v BLOB, ts INTEGER)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_ts ON cache (ts)")
+        self._conn.commit()
+
+    def get(self, prompt: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Return the cached ``(content, metrics)`` for *prompt*, or None if missing or stale."""
+        key = prompt_key(prompt)
+        hit = self._hot.get(key)
+        if hit is not None:
+            return hit
+
+        with self._lock:
+            row = self._conn.execute("SELECT v, ts FROM cache WHERE k = ?", (key,)).fetchone()
+        age = time.time() - row[1] if row is not None else None
+        if age is None or age > self.ttl:
+            return None
+        entry = json_codec.loads(row[0])
+        hit = (entry["content"], entry["metrics"])
+        self._hot.set(key, hit, ttl=self.ttl - age)
+        return hit
+
+    def set(self, prompt: str, content: str, metrics: Dict[str, Any]) -> None:
+        """Store the LLM response for *prompt*, dropping rows past their TTL."""
+        key = prompt_key(prompt)
+        value = json_codec.dumps({"content": content, "metrics": metrics})
+        now = int(time.time())
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (k, v, ts) VALUES (?, ?, ?)",
+                (key, value, now),
+            )
+            self._conn.execute("DELETE FROM cache WHERE ts < ?", (now - self.ttl,))
+            self._conn.commit()
+        self._hot.set(key, (content, metrics))
+
+
+_caches: Dict[Path, PromptCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_prompt_cache(path: Path) -> PromptCache:
+    """Return the shared cache stored at *path*."""
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = _caches[path] = PromptCache(path)
+        return cache
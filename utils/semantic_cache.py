@@ -0,0 +1,123 @@
+"""Embedding-keyed cache that reuses LLM responses for near-duplicate inputs.
+
+Disabled unless ``LUMINA_SEMANTIC_CACHE=1`` and sentence-transformers/numpy
+are installed.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+    SentenceTransformer = None
+
+logger = logging.getLogger(__name__)
+
+ENABLED = os.getenv("LUMINA_SEMANTIC_CACHE") == "1"
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+@lru_cache(maxsize=1)
+def _load_model() -> Any:
+    return SentenceTransformer(MODEL_NAME)
+
+
+class SemanticCache:
+    """Cosine-similarity cache persisted to SQLite and searched in memory.
+
+    Embeddings are L2-normalised, so a dot product against the in-memory
+    matrix gives cosine similarity. The least recently used entry is evicted
+    once ``maxsize`` is exceeded.
+    """
+
+    def __init__(self, path: Path, threshold: float = 0.92, maxsize: int = 10_000) -> None:
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "id INTEGER PRIMARY KEY, embedding BLOB NOT NULL, "
+            "response TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+        rows = self._conn.execute("SELECT id, embedding FROM entries ORDER BY id").fetchall()
+        self._ids = [row[0] for row in rows]
+        self._matrix = (
+            np.vstack([np.frombuffer(row[1], dtype=np.float32) for row in rows])
+            if rows else None
+        )
+
+    def embed(self, text: str) -> Any:
+        """Return the normalised float32 embedding for *text*."""
+        vector = _load_model().encode(text, normalize_embeddings=True)
+        return np.asarray(vector, dtype=np.float32)
+
+    def lookup(self, embedding: Any) -> Optional[str]:
+        """Return the cached response most similar to *embedding*, if close enough."""
+        with self._lock:
+            if self._matrix is None:
+                return None
+            scores = self._matrix @ embedding
+            best = int(scores.argmax())
+            if scores[best] < self.threshold:
+                return None
+            entry_id = self._ids[best]
+            row = self._conn.execute(
+                "SELECT response FROM entries WHERE id = ?", (entry_id,)
+            ).fetchone()
+            self._conn.execute(
+                "UPDATE entries SET last_used = ? WHERE id = ?", (time.time(), entry_id)
+            )
+            self._conn.commit()
+        return row[0] if row else None
+
+    def store(self, embedding: Any, response: str) -> None:
+        """Persist *response* under *embedding*, evicting the LRU entry if full."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO entries (embedding, response, last_used) VALUES (?, ?, ?)",
+                (embedding.tobytes(), response, time.time()),
+            )
+            self._ids.append(cursor.lastrowid)
+            row = embedding.reshape(1, -1)
+            self._matrix = row if self._matrix is None else np.vstack([self._matrix, row])
+
+            if len(self._ids) > self.maxsize:
+                (evicted,) = self._conn.execute(
+                    "SELECT id FROM entries ORDER BY last_used LIMIT 1"
+                ).fetchone()
+                self._conn.execute("DELETE FROM entries WHERE id = ?", (evicted,))
+                index = self._ids.index(evicted)
+                del self._ids[index]
+                self._matrix = np.delete(self._matrix, index, axis=0)
+            self._conn.commit()
+
+
+_caches: dict = {}
+_caches_lock = threading.Lock()
+
+
+def get_semantic_cache(path: Path) -> Optional[SemanticCache]:
+    """Return the shared cache stored at *path*, or None when disabled."""
+    if not ENABLED:
+        return None
+    if SentenceTransformer is None:
+        logger.warning("LUMINA_SEMANTIC_CACHE is set but sentence-transformers is not installed")
+        return None
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = _caches[path] = SemanticCache(path)
+        return cache
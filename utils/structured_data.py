@@ -1,7 +1,7 @@
 ﻿"""Utilities for building structured research records."""
 from __future__ import annotations
 
-from typing import Any, Iterable, List, Optional
+from typing import Any, Iterable, List, Mapping, Optional
 
 
 def _normalize_authors(authors: Any) -> List[str]:
@@ -60,3 +60,8 @@ def build_structured_record(
         "source": source,
         "pdf_url": pdf_url,
     }
+
+
+def build_structured_records(rows: Iterable[Mapping[str, Any]]) -> List[dict]:
+    """Return one record per mapping of ``build_structured_record`` keyword arguments."""
+    return [build_structured_record(**row) for row in rows]
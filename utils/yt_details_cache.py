@@ -0,0 +1,67 @@
+"""SQLite cache of YouTube video details keyed by video ID."""
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable
+
+from utils import json_codec
+
+DETAILS_TTL = 86400  # seconds
+
+
+class VideoDetailsCache:
+    """``video_id -> details`` store whose entries expire after *ttl* seconds."""
+
+    def __init__(self, path: Path, ttl: float = DETAILS_TTL) -> None:
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS details ("
+            "video_id TEXT PRIMARY KEY, payload BLOB, fetched_at INTEGER)"
+        )
+        self._conn.commit()
+
+    def get_many(self, video_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Return the fresh cached details for whichever of *video_ids* are present."""
+        ids = list(video_ids)
+        if not ids:
+            return {}
+        placeholders = ",".join("?" * len(ids))
+        cutoff = int(time.time() - self.ttl)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT video_id, payload FROM details "
+                f"WHERE fetched_at >= ? AND video_id IN ({placeholders})",
+                (cutoff, *ids),
+            ).fetchall()
+        return {video_id: json_codec.loads(payload) for video_id, payload in rows}
+
+    def set_many(self, details: Dict[str, Dict[str, Any]]) -> None:
+        """Store freshly fetched details for each video ID."""
+        if not details:
+            return
+        now = int(time.time())
+        rows = [(video_id, json_codec.dumps(payload), now) for video_id, payload in details.items()]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO details (video_id, payload, fetched_at) VALUES (?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+
+_caches: Dict[Path, VideoDetailsCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_details_cache(path: Path) -> VideoDetailsCache:
+    """Return the shared cache stored at *path*."""
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = _caches[path] = VideoDetailsCache(path)
+        return cache
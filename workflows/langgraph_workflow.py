@@ -14,6 +14,16 @@ from typing import Dict, List, Any, Optional, Set
 from datetime import datetime
 
 
+# Upper bound on each agent's research() call, in seconds. One stalled
+# agent must not hold up the others; override via config["<agent>_timeout"].
+AGENT_TIMEOUTS: Dict[str, float] = {
+    "perplexity": 90.0,
+    "youtube": 60.0,
+    "api": 15.0,
+}
+DEFAULT_AGENT_TIMEOUT = 60.0
+
+
 class ResearchWorkflow:
     """
     Orchestrates multi-agent research workflow with enhanced consolidation
@@ -121,8 +131,16 @@ class ResearchWorkflow:
             agent_names_used.append(agent_name)
             max_sources = config.get(f"max_{agent_name}_sources", 10)
             
-            # Create async task for agent
-            task = agent.research(query=query, domain=domain, max_sources=max_sources)
+            timeout = config.get(
+                f"{agent_name}_timeout",
+                AGENT_TIMEOUTS.get(agent_name, DEFAULT_AGENT_TIMEOUT)
+            )
+            
+            # Create async task for agent, bounded by its timeout
+            task = asyncio.wait_for(
+                agent.research(query=query, domain=domain, max_sources=max_sources),
+                timeout=timeout
+            )
             tasks.append(task)
         
         # Wait for all agents to complete
@@ -133,11 +151,12 @@ class ResearchWorkflow:
         processed_results = []
         for i, result in enumerate(agent_results):
             if isinstance(result, Exception):
-                print(f"   ❌ Agent {agent_names_used[i]} failed: {result}")
+                error = "timed out" if isinstance(result, asyncio.TimeoutError) else str(result)
+                print(f"   ❌ Agent {agent_names_used[i]} failed: {error}")
                 processed_results.append({
                     'agent_name': agent_names_used[i],
                     'status': 'failed',
-                    'error': str(result)
+                    'error': error
                 })
             else:
                 processed_results.append(result)
@@ -153,7 +172,21 @@ class ResearchWorkflow:
         )
         
         return consolidated
-    
+
+    async def close(self) -> None:
+        """Release pooled HTTP sessions held by the agents"""
+        for agent in self.agents.values():
+            close = getattr(agent, "close", None)
+            if close is not None:
+                await close()
+
+    async def __aenter__(self) -> "ResearchWorkflow":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Release the agents' sessions on the loop that opened them"""
+        await self.close()
+
     # ========================================================================
     # CONSOLIDATION - MAIN METHOD
     # ========================================================================